@@ -0,0 +1,148 @@
+# === benchmarks/feedback_eval_modes.py ===
+# split(3회 호출) vs combined(1회 호출) 피드백 평가 비교: 토큰 / p50·p95 지연 / 점수 일치도
+#
+# 실행 (OPENAI_API_KEY 필요, 실제 API 호출 발생):
+#   python benchmarks/feedback_eval_modes.py --limit 20 --concurrency 4 --out bench_output.json
+import sys, json, time, random, asyncio, argparse, statistics
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+
+from src.quiz.completion_feedback import EvaluationUnavailable, KoreanQuizEvaluator, QuizRequest
+
+QUIZ_DIR = BASE_DIR / "data" / "quiz"
+
+
+def load_reference_answers() -> list:
+    """SENTENCE_COMPLETION 퀴즈의 모범답안 수집"""
+    answers = []
+    for path in sorted(QUIZ_DIR.glob("*_SENTENCE_COMPLETION_*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        blocks = data if isinstance(data, list) else [data]
+        for block in blocks:
+            stack = [block.get("contents", [])] if isinstance(block, dict) else []
+            while stack:
+                item = stack.pop()
+                if isinstance(item, list):
+                    stack.extend(item)
+                elif isinstance(item, dict) and item.get("referenceAnswer"):
+                    answers.append(item["referenceAnswer"])
+    return answers
+
+
+def build_cases(answers: list, limit: int, seed: int = 42) -> list:
+    """모범답안 1개당 정답 / 부분 답 / 다른 문항 답 3가지 학습자 답안 생성"""
+    rng = random.Random(seed)
+    cases = []
+    for i, ref in enumerate(answers):
+        words = ref.split()
+        other = answers[(i + rng.randint(1, len(answers) - 1)) % len(answers)] if len(answers) > 1 else ""
+        for kind, user in (
+            ("exact", ref),
+            ("partial", " ".join(words[: max(1, len(words) // 2)])),
+            ("unrelated", other),
+        ):
+            cases.append({"kind": kind, "referenceAnswer": ref, "userAnswer": user})
+    rng.shuffle(cases)
+    return cases[:limit] if limit else cases
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+async def run_mode(mode: str, cases: list, concurrency: int) -> dict:
+    evaluator = KoreanQuizEvaluator(mode=mode, use_cache=False, use_fast_path=False)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, scores = [None] * len(cases), [None] * len(cases)
+
+    async def run_case(i: int, case: dict):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                res = await evaluator.solve_feedback_quiz(
+                    QuizRequest(contentId=i, referenceAnswer=case["referenceAnswer"], userAnswer=case["userAnswer"])
+                )
+                scores[i] = res.AIScore
+            except EvaluationUnavailable:
+                pass    # 모든 차원 실패 → 점수 없음 (일치율 비교에서 제외)
+            latencies[i] = time.perf_counter() - start
+
+    try:
+        await asyncio.gather(*[run_case(i, c) for i, c in enumerate(cases)])
+    finally:
+        await evaluator.aclose()
+
+    usage = {model: dict(u) for model, u in evaluator.usage.items()}
+    return {
+        "mode": mode,
+        "requests": len(cases),
+        "p50_latency_s": round(percentile(latencies, 50), 3),
+        "p95_latency_s": round(percentile(latencies, 95), 3),
+        "mean_latency_s": round(statistics.mean(latencies), 3) if latencies else 0.0,
+        "calls": sum(u["calls"] for u in usage.values()),
+        "prompt_tokens": sum(u["prompt_tokens"] for u in usage.values()),
+        "completion_tokens": sum(u["completion_tokens"] for u in usage.values()),
+        "usage_by_model": usage,
+        "failed": sum(score is None for score in scores),
+        "scores": scores,
+    }
+
+
+def agreement(cases: list, a: list, b: list) -> dict:
+    # 어느 한쪽이라도 점수를 내지 못한 쌍은 비교에서 제외
+    pairs = [(case, abs(x - y)) for case, x, y in zip(cases, a, b) if x is not None and y is not None]
+    diffs = [d for _, d in pairs]
+    by_kind = {}
+    for case, d in pairs:
+        by_kind.setdefault(case["kind"], []).append(d)
+    return {
+        "exact_match_rate": round(sum(d == 0 for d in diffs) / len(diffs), 3) if diffs else 0.0,
+        "within_10_rate": round(sum(d <= 10 for d in diffs) / len(diffs), 3) if diffs else 0.0,
+        "mean_abs_diff": round(statistics.mean(diffs), 2) if diffs else 0.0,
+        "mean_abs_diff_by_kind": {k: round(statistics.mean(v), 2) for k, v in by_kind.items()},
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="split vs combined 피드백 평가 벤치마크")
+    parser.add_argument("--limit", type=int, default=30, help="평가할 (모범답안, 학습자 답안) 쌍 수")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--out", type=str, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    cases = build_cases(load_reference_answers(), args.limit)
+    if not cases:
+        print("SENTENCE_COMPLETION 퀴즈 파일이 없습니다:", QUIZ_DIR)
+        return
+
+    split = await run_mode("split", cases, args.concurrency)
+    combined = await run_mode("combined", cases, args.concurrency)
+    report = {
+        "cases": len(cases),
+        "split": {k: v for k, v in split.items() if k != "scores"},
+        "combined": {k: v for k, v in combined.items() if k != "scores"},
+        "agreement": agreement(cases, split["scores"], combined["scores"]),
+    }
+
+    print(f"{'mode':<10}{'calls':>7}{'prompt_tok':>12}{'compl_tok':>11}{'p50(s)':>9}{'p95(s)':>9}")
+    for r in (split, combined):
+        print(
+            f"{r['mode']:<10}{r['calls']:>7}{r['prompt_tokens']:>12}{r['completion_tokens']:>11}"
+            f"{r['p50_latency_s']:>9}{r['p95_latency_s']:>9}"
+        )
+    print("agreement:", json.dumps(report["agreement"], ensure_ascii=False))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+# === benchmarks/import_time.py ===
+# 모듈 import 시간 / 메모리 측정 (python -X importtime 결과 집계)
+# + API 워커 실제 기동 비용 측정 (import 후 FastAPI startup 핸들러까지 실행한 시간·RSS)
+#
+# 실행:
+#   python benchmarks/import_time.py                       # 서빙(src.api.main) vs 파이프라인 비교 + 워커 기동 측정
+#   python benchmarks/import_time.py src.api.main --top 30 --out importtime.json
+#   FEEDBACK_FAST_PATH_WARMUP=1 python benchmarks/import_time.py --startup-only   # 선별 채점 모델 예열 시 비교
+import os, sys, json, argparse, subprocess
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+DEFAULT_MODULES = ["src.api.main", "src.pipeline.pipeline"]
+
+# 자식 프로세스에서 import 후 최대 RSS(KB, Linux 기준) 출력
+_CHILD_CODE = (
+    "import importlib, resource, sys\n"
+    "importlib.import_module(sys.argv[1])\n"
+    "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+)
+
+
+# 자식 프로세스에서 app import → startup 핸들러 실행 후 시간·최대 RSS·무거운 모듈 로드 여부 출력
+_STARTUP_CODE = (
+    "import asyncio, importlib, json, resource, sys, time\n"
+    "start = time.perf_counter()\n"
+    "module_name, attr = sys.argv[1].split(':')\n"
+    "app = getattr(importlib.import_module(module_name), attr)\n"
+    "imported = time.perf_counter()\n"
+    "asyncio.run(app.router.startup())\n"
+    "done = time.perf_counter()\n"
+    "print(json.dumps({\n"
+    "    'import_s': round(imported - start, 3),\n"
+    "    'startup_s': round(done - imported, 3),\n"
+    "    'total_s': round(done - start, 3),\n"
+    "    'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),\n"
+    "    'heavy_modules': [m for m in ('torch', 'sentence_transformers', 'kiwipiepy', 'sklearn')\n"
+    "                      if m in sys.modules],\n"
+    "}))\n"
+)
+
+# 기동 측정 시 외부 의존 동작 비활성화 (네트워크 예열·스케줄러) - 환경 변수로 덮어쓸 수 있음
+_STARTUP_ENV_DEFAULTS = {
+    "OPENAI_WARMUP_ENABLED": "0",
+    "PIPELINE_SCHEDULER_ENABLED": "0",
+}
+
+
+def parse_importtime(stderr: str) -> list:
+    """'import time: self [us] | cumulative | imported package' 줄 → [{module, self_us, cumulative_us, depth}]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": depth,
+        })
+    return rows
+
+
+def measure(module: str, top: int) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD_CODE, module],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    )
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        return {"module": module, "ok": False, "error": "\n".join(errors[-5:])}
+
+    # 최상위(depth 0) 항목의 cumulative 합 = 전체 import 시간
+    total_us = sum(r["cumulative_us"] for r in rows if r["depth"] == 0)
+    heaviest = sorted(rows, key=lambda r: r["self_us"], reverse=True)[:top]
+    return {
+        "module": module,
+        "ok": True,
+        "total_import_s": round(total_us / 1e6, 3),
+        "modules_loaded": len(rows),
+        "max_rss_mb": round(int(proc.stdout.strip().splitlines()[-1]) / 1024, 1),
+        "top_self": heaviest,
+    }
+
+
+def measure_startup(app_path: str) -> dict:
+    """uvicorn 워커 1개가 요청을 받기 전까지의 비용 (import + startup 핸들러)"""
+    env = {**_STARTUP_ENV_DEFAULTS, **os.environ}
+    proc = subprocess.run(
+        [sys.executable, "-c", _STARTUP_CODE, app_path],
+        cwd=BASE_DIR, capture_output=True, text=True, env=env,
+    )
+    if proc.returncode != 0:
+        return {"app": app_path, "ok": False, "error": "\n".join(proc.stderr.splitlines()[-5:])}
+    return {"app": app_path, "ok": True, **json.loads(proc.stdout.strip().splitlines()[-1])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="python -X importtime 기반 import 시간 측정")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=15, help="self 시간 상위 N개 모듈 출력")
+    parser.add_argument("--out", type=str, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--app", type=str, default="src.api.main:app", help="기동 시간을 측정할 FastAPI 앱")
+    parser.add_argument("--no-startup", action="store_true", help="워커 기동 측정 생략")
+    parser.add_argument("--startup-only", action="store_true", help="import 시간 측정 생략")
+    args = parser.parse_args()
+
+    results = [] if args.startup_only else [measure(m, args.top) for m in args.modules]
+    for r in results:
+        print(f"\n=== {r['module']} ===")
+        if not r["ok"]:
+            print("import 실패:", r["error"])
+            continue
+        print(f"import 시간: {r['total_import_s']}s / 모듈 수: {r['modules_loaded']} / 최대 RSS: {r['max_rss_mb']}MB")
+        for row in r["top_self"]:
+            print(f"  {row['self_us'] / 1000:>9.1f}ms  {row['module']}")
+
+    startup = None if args.no_startup else measure_startup(args.app)
+    if startup is not None:
+        print(f"\n=== 워커 기동: {startup['app']} ===")
+        if not startup["ok"]:
+            print("기동 실패:", startup["error"])
+        else:
+            print(f"import {startup['import_s']}s + startup {startup['startup_s']}s = {startup['total_s']}s "
+                  f"/ 최대 RSS: {startup['max_rss_mb']}MB")
+            print(f"로드된 무거운 모듈: {', '.join(startup['heavy_modules']) or '없음'}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"imports": results, "startup": startup}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# === src/api/admission.py ===
+# 피드백 평가 요청 수용 제어: 동시 실행 수 제한 + 대기열 길이 제한 + 대기 시간 예산.
+# 한도를 넘는 요청은 OpenAI 호출을 쌓지 않고 바로 429(Retry-After)로 돌려보냄
+import os, math, time, asyncio, logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """대기열 초과 또는 대기 시간 예산 초과 → 429"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """FIFO 대기열을 가진 동시 실행 제한기. 이벤트 루프 1개(uvicorn 워커)당 1개 사용"""
+
+    def __init__(self, max_concurrency: int = 16, max_queue: int = 64, queue_timeout: float = 5.0):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._active = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        # 대기열 중 bounded=False(배치 항목) 대기자 수 - 단건 요청 거절 기준(대기열 길이)에서 제외
+        self._unbounded_waiting = 0
+
+        # 최근 대기 / 처리 시간 (지표·Retry-After 추정용)
+        self._wait_times = deque(maxlen=1024)
+        self._service_times = deque(maxlen=1024)
+        self.counters = {
+            "admitted": 0,
+            "rejectedQueueFull": 0,
+            "rejectedTimeout": 0,
+            "maxQueueDepth": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        return cls(
+            max_concurrency=int(os.getenv("FEEDBACK_MAX_CONCURRENCY", "16")),
+            max_queue=int(os.getenv("FEEDBACK_MAX_QUEUE", "64")),
+            queue_timeout=float(os.getenv("FEEDBACK_QUEUE_TIMEOUT", "5")),
+        )
+
+    # === 지표 ===
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def bounded_queue_depth(self) -> int:
+        """대기열 제한 대상(단건 요청) 대기자 수"""
+        return len(self._waiters) - self._unbounded_waiting
+
+    @staticmethod
+    def _percentile(values, pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def snapshot(self) -> dict:
+        waits = list(self._wait_times)
+        return {
+            "maxConcurrency": self.max_concurrency,
+            "maxQueue": self.max_queue,
+            "queueTimeout": self.queue_timeout,
+            "active": self._active,
+            "queueDepth": self.queue_depth,
+            "batchQueueDepth": self._unbounded_waiting,
+            **self.counters,
+            "waitP50": round(self._percentile(waits, 50), 4),
+            "waitP95": round(self._percentile(waits, 95), 4),
+            "waitMax": round(max(waits), 4) if waits else 0.0,
+            "serviceP50": round(self._percentile(list(self._service_times), 50), 4),
+        }
+
+    def retry_after(self) -> int:
+        """대기열이 비워질 때까지 걸릴 시간 추정 (초, 최소 1)"""
+        service = self._percentile(list(self._service_times), 50) or 1.0
+        backlog = self.queue_depth + self._active
+        return max(1, math.ceil(service * backlog / self.max_concurrency))
+
+    def check_capacity(self):
+        """대기 없이 과부하 여부만 확인 (배치처럼 여러 슬롯을 나눠 쓰는 요청의 입구 검사)"""
+        if self.bounded_queue_depth >= self.max_queue:
+            self.counters["rejectedQueueFull"] += 1
+            raise AdmissionRejected("queue full", self.retry_after())
+
+    # === 획득 / 반환 ===
+    async def acquire(self, bounded: bool = True) -> float:
+        """실행 슬롯 획득 → 대기한 시간(초) 반환.
+        bounded=False 는 이미 수용된 요청(배치 항목 등)용 - 대기열 길이·시간 제한 없이 순서만 기다림.
+        이런 대기자는 대기열 길이 제한 계산에서 빠지므로 배치 트래픽이 단건 요청을 429로 밀어내지 않음"""
+        start = time.monotonic()
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self._admitted(0.0)
+            return 0.0
+
+        if bounded and self.bounded_queue_depth >= self.max_queue:
+            self.counters["rejectedQueueFull"] += 1
+            raise AdmissionRejected("queue full", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counters["maxQueueDepth"] = max(self.counters["maxQueueDepth"], len(self._waiters))
+        if not bounded:
+            self._unbounded_waiting += 1
+        try:
+            if bounded:
+                await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            else:
+                await waiter
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # 슬롯을 넘겨받은 직후 취소/타임아웃 → 다음 대기자에게 양보
+                self.release()
+            else:
+                waiter.cancel()
+                self._remove(waiter)
+            if isinstance(exc, asyncio.TimeoutError):
+                self.counters["rejectedTimeout"] += 1
+                raise AdmissionRejected("queue timeout", self.retry_after()) from None
+            raise
+        finally:
+            if not bounded:
+                self._unbounded_waiting -= 1
+
+        waited = time.monotonic() - start
+        self._admitted(waited)
+        return waited
+
+    def release(self, service_time: float = None):
+        """슬롯 반환 - 대기자가 있으면 카운트 유지한 채 바로 넘겨줌"""
+        if service_time is not None:
+            self._service_times.append(service_time)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def releaser(self) -> Callable[[], None]:
+        """acquire()로 얻은 슬롯을 딱 한 번만 반환하는 콜백.
+        스트리밍 응답처럼 반환 경로가 여러 개(본문 종료·응답 후처리·객체 소멸)인 경우 모두에서 호출"""
+        start = time.monotonic()
+        released = False
+
+        def release_once():
+            nonlocal released
+            if not released:
+                released = True
+                self.release(time.monotonic() - start)
+
+        return release_once
+
+    def _remove(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _admitted(self, waited: float):
+        self.counters["admitted"] += 1
+        self._wait_times.append(waited)
+
+    @asynccontextmanager
+    async def slot(self, bounded: bool = True):
+        await self.acquire(bounded)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - start)
+
+
+feedback_admission = AdmissionController.from_env()
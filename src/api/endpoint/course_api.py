@@ -1,14 +1,54 @@
-from fastapi import APIRouter, HTTPException
-from src.pipeline.pipeline import run_learning_pipeline
+from fastapi import APIRouter, HTTPException, Query, Request
+from src.api.package_cache import (
+    package_cache, CachedBody, PackageFormatError, QUIZ_PACKAGE_DIR, DATE_RE, decode_cursor, encode_cursor,
+    negotiate_encoding,
+)
+from src.wrapper.package_artifacts import artifact_stem
+from src.wrapper.package_projection import projection_name
 from datetime import datetime
+from zoneinfo import ZoneInfo
 from pathlib import Path
+from typing import Annotated, Literal, Optional
 import json
 import logging
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
 router = APIRouter(prefix="/api/course", tags=["Course"])
 logger = logging.getLogger(__name__)
 
+# === 프로젝션 파라미터 (wrapper가 배포 시 미리 만든 조합과 동일) ===
+LevelParam = Annotated[
+    Optional[Literal["N", "I", "E"]],
+    Query(description="해당 레벨(N/I/E) 퀴즈만 포함"),
+]
+FieldsParam = Annotated[
+    Literal["full", "steps", "skeleton"],
+    Query(description="full: 전체 / steps: 요약문·퀴즈 contents 제외 / skeleton: 요약문·퀴즈 제외"),
+]
+
+# === 페이지네이션 기본값 (패키지 파일 단위) ===
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+def _cached_response(request: Request, cached: CachedBody) -> Response:
+    """조건부 요청이면 304, 아니면 Accept-Encoding에 맞춰 사전 압축된 바이트를 그대로 전송"""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept-Encoding", "ETag": cached.etag(encoding)}
+    last_modified = cached.last_modified()
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+
+    if cached.is_not_modified(
+        request.headers.get("if-none-match"),
+        request.headers.get("if-modified-since"),
+    ):
+        return Response(status_code=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=cached.encoded(encoding), media_type="application/json", headers=headers)
+
+
 @router.get("/test")
 def get_test_data():
     # 프로젝트 기준 상대 경로 설정
@@ -34,89 +74,147 @@ def get_test_data():
 
 
 @router.get("/today")
-def get_today_data():
-    """오늘 날짜 기준 통합 패키지 JSON 리턴"""
-    base_dir = Path(__file__).resolve().parents[3]
-    quiz_package_dir = base_dir / "data" / "quiz" / "package"
-
+def get_today_data(request: Request, level: LevelParam = None, fields: FieldsParam = "full"):
+    """오늘 날짜 기준 통합 패키지 JSON 리턴 (프로세스 캐시에서 제공)"""
     today = datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y-%m-%d")
-    package_files = sorted(list(quiz_package_dir.glob(f"*_{today}_package.json")))
-    logger.info(
-        "get_today_data base_dir=%s quiz_package_dir=%s today=%s file_count=%d",
-        base_dir,
-        quiz_package_dir,
-        today,
-        len(package_files),
-    )
-    if package_files:
-        logger.info(
-            "get_today_data files=%s",
-            [str(p) for p in package_files],
-        )
+    projection = projection_name(level, fields)
+    package_files = [r.path for r in package_cache.select(today, today)[0]]
+    logger.debug("get_today_data today=%s file_count=%d", today, len(package_files))
 
     # 1. 파일이 없을 경우: 백엔드 형식에 맞게 {"courses": []} 반환
     if not package_files:
         logger.warning("get_today_data no package files found")
         return {"courses": []}
 
-    # 2. 모든 패키지를 하나의 리스트로 통합
-    all_courses = []
+    # 2. 모든 패키지를 하나의 리스트로 통합 (wrapper 일별 번들 우선, mtime/size 변경 시에만 재파싱)
+    cached = package_cache.merged(
+        package_files,
+        mode="today",
+        artifact=artifact_stem(f"{today}_today", projection),
+        projection=projection,
+    )
+
+    # 3. AICourseListResponse 형식으로 래핑된 바이트 그대로 반환
+    return _cached_response(request, cached)
 
-    for f in package_files:
-        logger.info("get_today_data reading file=%s", f)
-        with open(f, "r", encoding="utf-8") as fp:
-            course_data = json.load(fp)
-            if isinstance(course_data, list):
-                logger.info("get_today_data file=%s list_len=%d", f, len(course_data))
-                all_courses.extend(course_data)
-            else:
-                logger.info("get_today_data file=%s type=%s", f, type(course_data))
-                all_courses.append(course_data)
 
-                # 3. AICourseListResponse 형식으로 래핑하여 반환
-    logger.info("get_today_data total_courses=%d", len(all_courses))
-    return {"courses": all_courses}
+def _stream_packages(package_files: list, fields: dict = None, projection: str = None):
+    """StreamingResponse용 제너레이터 - 파일 형식은 응답 시작 전에 검사(package_cache.validate)하고,
+    그 뒤 발생한 오류(파일 삭제 등)는 응답을 끊음 → 클라이언트는 완결되지 않은 JSON 본문을 실패로 처리해야 함"""
+    try:
+        yield from package_cache.iter_merged(package_files, mode="courses", fields=fields, projection=projection)
+    except Exception:
+        logger.exception("get_all_packages stream aborted")
+        raise
 
 
 @router.get("/packages/all")
-def get_all_packages():
-    """data/quiz/package 내 모든 JSON을 통합해 courses 리스트로 반환"""
-    base_dir = Path(__file__).resolve().parents[3]
-    quiz_package_dir = base_dir / "data" / "quiz" / "package"
-
-    package_files = sorted(list(quiz_package_dir.glob("*.json")))
-    logger.info(
-        "get_all_packages base_dir=%s quiz_package_dir=%s file_count=%d",
-        base_dir,
-        quiz_package_dir,
-        len(package_files),
+def get_all_packages(
+    request: Request,
+    date_from: Optional[str] = Query(None, alias="from", description="시작 날짜 (YYYY-MM-DD, 포함)"),
+    date_to: Optional[str] = Query(None, alias="to", description="종료 날짜 (YYYY-MM-DD, 포함)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="페이지당 패키지 파일 수"),
+    level: LevelParam = None,
+    fields: FieldsParam = "full",
+    stream: bool = Query(False, description="true면 파일 단위로 스트리밍 응답"),
+):
+    """data/quiz/package 내 패키지를 통합해 courses 리스트로 반환 (날짜 범위 / 커서 페이지네이션 지원)"""
+    for value in (date_from, date_to):
+        if value is not None and not DATE_RE.match(value):
+            raise HTTPException(status_code=400, detail=f"Invalid date format (YYYY-MM-DD): {value}")
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # 커서/페이지 크기를 쓰는 요청만 nextCursor를 포함 (기존 응답 형식 유지)
+    projection = projection_name(level, fields)
+    paginated = cursor is not None or limit is not None
+    if paginated and limit is None:
+        limit = DEFAULT_PAGE_SIZE
+
+    extra = None
+    if paginated or date_from or date_to:
+        # 범위/커서 조회는 (날짜, 토픽) 인덱스 순서 ({topic}_{date}_package.json 파일만 대상)
+        refs, has_more = package_cache.select(date_from, date_to, after=after, limit=limit)
+        package_files = [r.path for r in refs]
+        if paginated:
+            extra = {"nextCursor": encode_cursor(refs[-1]) if has_more else None}
+    else:
+        # 파라미터 없는 기존 요청은 이전과 같이 디렉토리 내 모든 JSON을 파일명 순으로
+        package_files = package_cache.list_files(QUIZ_PACKAGE_DIR, "*.json")
+    logger.debug(
+        "get_all_packages from=%s to=%s cursor=%s limit=%s projection=%s file_count=%d stream=%s",
+        date_from, date_to, cursor, limit, projection, len(package_files), stream,
     )
+
     if not package_files:
         logger.warning("get_all_packages no package files found")
-        return {"courses": []}
+        return {"courses": [], **extra} if extra else {"courses": []}
 
-    all_courses = []
-    for f in package_files:
-        logger.info("get_all_packages reading file=%s", f)
+    # 스트리밍 모드: 전체 목록을 메모리에 올리지 않고 파일 1개씩 전송
+    # 200을 보내기 전에 모든 파일 형식을 검사해 깨진 패키지는 500으로 응답
+    if stream:
         try:
-            with open(f, "r", encoding="utf-8") as fp:
-                data = json.load(fp)
-        except json.JSONDecodeError:
-            logger.exception("get_all_packages invalid JSON format: %s", f.name)
-            raise HTTPException(status_code=500, detail=f"Invalid JSON format: {f.name}")
-        except Exception as e:
-            logger.exception("get_all_packages unexpected error: %s", f.name)
-            raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
-
-        if isinstance(data, dict) and isinstance(data.get("courses"), list):
-            logger.info("get_all_packages file=%s courses_len=%d", f, len(data["courses"]))
-            all_courses.extend(data["courses"])
-        elif isinstance(data, list):
-            logger.info("get_all_packages file=%s list_len=%d", f, len(data))
-            all_courses.extend(data)
-        else:
-            logger.info("get_all_packages file=%s type=%s", f, type(data))
-            all_courses.append(data)
-
-    logger.info("get_all_packages total_courses=%d", len(all_courses))
-    return {"courses": all_courses}
+            package_cache.validate(package_files, projection)
+        except PackageFormatError as e:
+            logger.exception("get_all_packages invalid JSON format: %s", e.path.name)
+            raise HTTPException(status_code=500, detail=str(e))
+        return StreamingResponse(_stream_packages(package_files, extra, projection), media_type="application/json")
+
+    try:
+        cached = package_cache.merged(package_files, mode="courses", fields=extra, projection=projection)
+    except PackageFormatError as e:
+        logger.exception("get_all_packages invalid JSON format: %s", e.path.name)
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        logger.exception("get_all_packages unexpected error")
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+    return _cached_response(request, cached)
+
+
+def _find_package(date: str, topic: str):
+    """date("today" 허용) + topic(영문) → 패키지 인덱스 항목"""
+    if date == "today":
+        date = datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y-%m-%d")
+    if not DATE_RE.match(date):
+        raise HTTPException(status_code=400, detail=f"Invalid date format (YYYY-MM-DD): {date}")
+
+    for ref in package_cache.select(date, date)[0]:
+        if ref.topic == topic:
+            return ref
+    raise HTTPException(status_code=404, detail=f"Package not found: {topic}_{date}")
+
+
+def _fragment_response(request: Request, date: str, topic: str, course_id: int,
+                       session_id: int = None, projection: str = None):
+    ref = _find_package(date, topic)
+    try:
+        cached = package_cache.fragment(ref.path, course_id, session_id, projection)
+    except PackageFormatError as e:
+        logger.exception("get_course_fragment invalid JSON format: %s", e.path.name)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if cached is None:
+        target = f"courseId={course_id}" + (f", sessionId={session_id}" if session_id is not None else "")
+        raise HTTPException(status_code=404, detail=f"Not found in {ref.path.name}: {target}")
+    return _cached_response(request, cached)
+
+
+@router.get("/{date}/{topic}/{course_id}")
+def get_course(request: Request, date: str, topic: str, course_id: int,
+               level: LevelParam = None, fields: FieldsParam = "full"):
+    """패키지 전체를 파싱하지 않고 코스 1개만 반환 (wrapper 오프셋 인덱스 사용)"""
+    return _fragment_response(request, date, topic, course_id, projection=projection_name(level, fields))
+
+
+@router.get("/{date}/{topic}/{course_id}/sessions/{session_id}")
+def get_session(request: Request, date: str, topic: str, course_id: int, session_id: int,
+                level: LevelParam = None, fields: FieldsParam = "full"):
+    """세션 1개(퀴즈 포함)만 반환"""
+    return _fragment_response(request, date, topic, course_id, session_id, projection_name(level, fields))
@@ -0,0 +1,19 @@
+import os
+from fastapi import APIRouter
+
+from src.api.leader import scheduler_leader
+from src.api.pipeline_jobs import pipeline_state
+
+router = APIRouter(prefix="/api/pipeline", tags=["Pipeline"])
+
+
+@router.get("/status")
+async def get_pipeline_status() -> dict:
+    """최근 스케줄 파이프라인 실행 상태 - 실행 방식, 현재 단계, 진행 이벤트, 결과/오류.
+    실행 상태는 스케줄러 리더 워커에만 있으므로 응답한 워커가 리더인지 함께 표시"""
+    return {
+        **pipeline_state.snapshot(),
+        "workerPid": os.getpid(),
+        "isLeader": scheduler_leader.is_leader,
+        "leaderPid": scheduler_leader.leader_pid(),
+    }
@@ -1,17 +1,162 @@
+import os
+import json
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException
+import weakref
+from contextlib import asynccontextmanager
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
-from src.quiz.completion_feedback import KoreanQuizEvaluator, QuizRequest, QuizResponse
+from src.api.admission import AdmissionRejected, feedback_admission
+from src.quiz.completion_feedback import (
+    EvaluationUnavailable, KoreanQuizEvaluator, QuizBatchResult, QuizRequest, QuizResponse,
+)
 
 router = APIRouter(prefix="/api/quiz", tags=["Quiz"])
 logger = logging.getLogger(__name__)
 
+# === 배치 평가 동시성 (배치 1건이 전역 실행 슬롯을 독차지하지 않도록 배치당 상한) ===
+FEEDBACK_BATCH_CONCURRENCY = int(os.getenv("FEEDBACK_BATCH_CONCURRENCY", "8"))
+FEEDBACK_BATCH_MAX_ITEMS = int(os.getenv("FEEDBACK_BATCH_MAX_ITEMS", "100"))
+
+
+def _overloaded(exc: AdmissionRejected) -> HTTPException:
+    logger.warning("Quiz feedback rejected (%s), retry after %ss", exc.reason, exc.retry_after)
+    return HTTPException(
+        status_code=429,
+        detail=f"Feedback evaluation overloaded ({exc.reason})",
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+def get_evaluator(http_request: Request) -> KoreanQuizEvaluator:
+    """앱 기동 시 생성된 평가기(공유 커넥션 풀)를 주입. 기동 훅을 거치지 않은 경우 최초 요청 시 생성"""
+    evaluator = getattr(http_request.app.state, "quiz_evaluator", None)
+    if evaluator is None:
+        evaluator = KoreanQuizEvaluator()
+        http_request.app.state.quiz_evaluator = evaluator
+    return evaluator
+
 
 @router.post("/feedback", response_model=QuizResponse)
-async def get_feedback_quiz(request: QuizRequest) -> QuizResponse:
+async def get_feedback_quiz(
+    request: QuizRequest,
+    evaluator: KoreanQuizEvaluator = Depends(get_evaluator),
+) -> QuizResponse:
     logger.info("Quiz request received: %s", request.model_dump())
-    evaluator = KoreanQuizEvaluator()
     try:
-        return await evaluator.solve_feedback_quiz(request)
+        # 수용 제어는 LLM 평가에만 적용 (캐시 히트·진행 중인 같은 평가 공유는 과부하 시에도 바로 응답)
+        return await evaluator.solve_feedback_quiz(request, limiter=feedback_admission.slot)
+    except AdmissionRejected as exc:
+        raise _overloaded(exc) from exc
+    except EvaluationUnavailable as exc:
+        raise HTTPException(status_code=503, detail=f"Quiz evaluation failed: {exc}") from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Quiz evaluation failed: {exc}") from exc
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/feedback/stream")
+async def stream_feedback_quiz(
+    request: QuizRequest,
+    evaluator: KoreanQuizEvaluator = Depends(get_evaluator),
+) -> StreamingResponse:
+    """SSE 피드백 - 차원별(meaning/context/grammar) 결과를 끝나는 순서대로 `dimension` 이벤트로,
+    가중 합산 결과를 `result` 이벤트로 전송 (형식은 /feedback 응답과 동일)"""
+    logger.info("Quiz stream request received: %s", request.model_dump())
+
+    # 캐시 히트는 슬롯 없이 최종 결과만 전달 (과부하 중에도 429로 돌려보내지 않음)
+    cached = await evaluator.cached_response(request)
+    if cached is not None:
+        async def cached_stream():
+            yield _sse("result", cached.model_dump())
+
+        return StreamingResponse(
+            cached_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    # 429를 보낼 수 있도록 응답 시작 전에 슬롯 획득
+    try:
+        await feedback_admission.acquire()
+    except AdmissionRejected as exc:
+        raise _overloaded(exc) from exc
+    release_slot = feedback_admission.releaser()
+
+    async def event_stream():
+        try:
+            async for event, data in evaluator.stream_feedback_quiz(request):
+                yield _sse(event, data)
+        except Exception as exc:
+            logger.exception("Quiz stream evaluation failed: contentId=%s", request.contentId)
+            yield _sse("error", {"contentId": request.contentId, "detail": f"Quiz evaluation failed: {exc}"})
+        finally:
+            release_slot()
+
+    # 본문이 시작되지 않은 채 끝나면(클라이언트 연결 끊김, 응답 취소) 제너레이터 finally가 실행되지 않음
+    # → 응답 후처리(BackgroundTask)와 스트림 객체 소멸 시에도 반환 (release_slot은 1회만 동작)
+    stream = event_stream()
+    weakref.finalize(stream, release_slot)
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(release_slot),
+    )
+
+
+@router.post("/feedback/batch", response_model=List[QuizBatchResult])
+async def get_feedback_quiz_batch(
+    requests: List[QuizRequest],
+    evaluator: KoreanQuizEvaluator = Depends(get_evaluator),
+) -> List[QuizBatchResult]:
+    """세션 단위 일괄 채점 - 입력 순서대로 결과 반환, 항목별 실패는 error 필드로 전달"""
+    if len(requests) > FEEDBACK_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many items: {len(requests)} (max {FEEDBACK_BATCH_MAX_ITEMS})",
+        )
+    try:
+        feedback_admission.check_capacity()
+    except AdmissionRejected as exc:
+        raise _overloaded(exc) from exc
+    logger.info("Quiz batch request received: count=%d", len(requests))
+
+    # 입구에서 수용된 배치의 항목은 대기열 제한 없이 전역 슬롯 순서를 기다림
+    # (배치 대기자는 단건 요청의 대기열 길이 제한에 포함되지 않음)
+    batch_semaphore = asyncio.Semaphore(FEEDBACK_BATCH_CONCURRENCY)
+
+    @asynccontextmanager
+    async def batch_slot():
+        async with batch_semaphore, feedback_admission.slot(bounded=False):
+            yield
+
+    async def evaluate_one(item: QuizRequest) -> QuizBatchResult:
+        try:
+            # 캐시 히트 항목은 슬롯을 기다리지 않음
+            result = await evaluator.solve_feedback_quiz(item, limiter=batch_slot)
+            return QuizBatchResult(contentId=item.contentId, result=result)
+        except Exception as exc:
+            logger.exception("Quiz batch item failed: contentId=%s", item.contentId)
+            return QuizBatchResult(contentId=item.contentId, error=f"Quiz evaluation failed: {exc}")
+
+    return await asyncio.gather(*[evaluate_one(item) for item in requests])
+
+
+@router.get("/feedback/stats")
+async def get_feedback_stats(evaluator: KoreanQuizEvaluator = Depends(get_evaluator)) -> dict:
+    """평가기 운영 지표 - 수용 제어(대기열 길이·대기 시간), 로컬 선별 채점 확정 비율, 캐시 적중, 차원별 시간 초과·hedge, 모델별 호출·토큰 사용량"""
+    return {
+        "mode": evaluator.mode,
+        "admission": feedback_admission.snapshot(),
+        "fastPath": evaluator.fast_scorer.snapshot() if evaluator.fast_scorer else None,
+        "cache": dict(evaluator.cache.stats) if evaluator.cache else None,
+        "dimensions": evaluator.guard.snapshot(),
+        "usage": {model: dict(u) for model, u in evaluator.usage.items()},
+    }
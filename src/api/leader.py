@@ -0,0 +1,96 @@
+# === src/api/leader.py ===
+# uvicorn 워커 간 스케줄러 리더 선출 (파일 잠금 기반)
+# 잠금 파일에 대한 배타적 flock을 가진 프로세스 1개만 daily_learning_pipeline 스케줄러를 실행.
+# 리더 프로세스가 죽으면 OS가 잠금을 해제하고, 다른 워커가 주기적 재시도로 리더를 이어받음
+import os, asyncio, logging
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows 등 - 단일 프로세스 실행으로 간주
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_LOCK_PATH = BASE_DIR / "data" / "scheduler.lock"
+
+
+class LeaderElection:
+    def __init__(self, lock_path: Path = None, poll_interval: float = 30.0):
+        self.lock_path = Path(lock_path or DEFAULT_LOCK_PATH)
+        self.poll_interval = poll_interval
+        self.is_leader = False
+        self._fd: Optional[int] = None
+        self._poll_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls) -> "LeaderElection":
+        return cls(
+            lock_path=os.getenv("PIPELINE_LEADER_LOCK") or None,
+            poll_interval=float(os.getenv("PIPELINE_LEADER_POLL_INTERVAL", "30")),
+        )
+
+    def try_acquire(self) -> bool:
+        """대기 없이 잠금 시도 → 성공하면 리더 (잠금은 프로세스 종료 또는 release() 시 해제)"""
+        if self.is_leader:
+            return True
+        if fcntl is None:
+            logger.warning("fcntl 미지원 환경 → 리더 선출 없이 스케줄러 실행 (단일 워커로 실행하세요)")
+            self.is_leader = True
+            return True
+
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        # 진단용으로 리더 pid 기록
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        self.is_leader = True
+        logger.info("스케줄러 리더 획득 (pid=%s, lock=%s)", os.getpid(), self.lock_path)
+        return True
+
+    def leader_pid(self) -> Optional[int]:
+        """현재 리더 pid (잠금 파일 기록 기준)"""
+        try:
+            return int(self.lock_path.read_text().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    async def run(self, on_elected: Callable[[], Awaitable[None]]):
+        """리더가 되면 on_elected 실행. 아니면 poll_interval마다 재시도해 리더 장애 시 인계"""
+        if self.try_acquire():
+            await on_elected()
+            return
+        logger.info("스케줄러 리더 아님 (leader pid=%s) → %.0f초 간격으로 대기", self.leader_pid(), self.poll_interval)
+        self._poll_task = asyncio.create_task(self._poll(on_elected))
+
+    async def _poll(self, on_elected):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if self.try_acquire():
+                logger.info("이전 리더 종료 감지 → 스케줄러 인계")
+                await on_elected()
+                return
+
+    def release(self):
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+        if self._fd is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        self.is_leader = False
+
+
+scheduler_leader = LeaderElection.from_env()
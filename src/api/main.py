@@ -1,7 +1,10 @@
 from fastapi import FastAPI
 from src.api.endpoint.course_api import router as course_router
 from src.api.endpoint.quiz_api import router as quiz_router
-from src.pipeline.pipeline import run_learning_pipeline
+from src.api.endpoint.pipeline_api import router as pipeline_router
+from src.api.pipeline_jobs import execution_mode, run_pipeline_job
+from src.api.leader import scheduler_leader as leader
+from src.quiz.completion_feedback import KoreanQuizEvaluator
 from datetime import datetime
 import asyncio
 import pytz
@@ -16,6 +19,7 @@ app = FastAPI(title="NIEDU AI Server")
 # 라우터 등록
 app.include_router(course_router)
 app.include_router(quiz_router)
+app.include_router(pipeline_router)
 
 KST = pytz.timezone("Asia/Seoul")
 logger = logging.getLogger(__name__)
@@ -35,21 +39,55 @@ def _scheduler_listener(event):
         logger.info("✅ 스케줄 잡 완료")
 
 async def _run_pipeline_job():
-    logger.info("⏰ 스케줄 잡 시작 → 자동 파이프라인 실행")
+    logger.info("⏰ 스케줄 잡 시작 → 자동 파이프라인 실행 (%s)", execution_mode())
     try:
-        await asyncio.to_thread(run_learning_pipeline)
+        await run_pipeline_job()
     except Exception:
         logger.exception("❌ 파이프라인 실행 실패")
         raise
 
+async def _warmup_openai(evaluator: KoreanQuizEvaluator):
+    try:
+        await evaluator.warmup(int(os.getenv("OPENAI_WARMUP_CONNECTIONS", "3")))
+    except Exception:
+        logger.exception("OpenAI 커넥션 예열 실패")
+
+@app.on_event("startup")
+async def init_quiz_evaluator():
+    """피드백 평가기 1회 생성 + 커넥션 예열 (요청마다 클라이언트를 새로 만들지 않음)"""
+    app.state.quiz_evaluator = KoreanQuizEvaluator()
+    app.state.openai_warmup = None
+    if os.getenv("OPENAI_WARMUP_ENABLED", "1") == "1":
+        # 기동을 막지 않도록 백그라운드에서 예열 (OpenAI 장애 시에도 워커는 바로 요청을 받음)
+        app.state.openai_warmup = asyncio.create_task(_warmup_openai(app.state.quiz_evaluator))
+    # 로컬 선별 채점 모델(형태소 분석기·임베딩, torch)은 기본적으로 첫 선별 채점 시 로드.
+    # FEEDBACK_FAST_PATH_WARMUP=1 이면 기동 시 미리 로드 (워커마다 기동 시간·메모리 증가)
+    fast_scorer = app.state.quiz_evaluator.fast_scorer
+    if fast_scorer is not None and os.getenv("FEEDBACK_FAST_PATH_WARMUP", "0") == "1":
+        await asyncio.to_thread(fast_scorer.warmup)
+
+@app.on_event("shutdown")
+async def close_quiz_evaluator():
+    """피드백 평가기 커넥션 풀 정리"""
+    warmup = getattr(app.state, "openai_warmup", None)
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    evaluator = getattr(app.state, "quiz_evaluator", None)
+    if evaluator:
+        await evaluator.aclose()
+
 @app.on_event("startup")
 async def on_startup():
-    """서버 기동 시 자동 스케줄러 실행"""
-    global scheduler
+    """서버 기동 시 리더 선출 → 리더 워커만 자동 스케줄러 실행 (나머지는 리더 장애 시 인계)
+    --workers N 으로 띄워도 daily_learning_pipeline은 1회만 실행됨"""
     if os.getenv("PIPELINE_SCHEDULER_ENABLED", "1") != "1":
         logger.warning("파이프라인 스케줄러 비활성화됨 (PIPELINE_SCHEDULER_ENABLED!=1)")
         return
 
+    await leader.run(_start_scheduler)
+
+async def _start_scheduler():
+    global scheduler
     if scheduler and scheduler.running:
         logger.warning("스케줄러가 이미 실행 중입니다.")
         return
@@ -77,8 +115,9 @@ async def on_startup():
 
 @app.on_event("shutdown")
 async def on_shutdown():
-    """서버 종료 시 스케줄러 정리"""
+    """서버 종료 시 스케줄러 정리 + 리더 잠금 해제"""
     global scheduler
     if scheduler:
         logger.info("스케줄러 종료")
         scheduler.shutdown(wait=False)
+    leader.release()
@@ -0,0 +1,548 @@
+# === src/api/package_cache.py ===
+import os, re, json, base64, bisect, hashlib, logging, threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+from email.utils import formatdate, parsedate_to_datetime
+from src.wrapper.package_artifacts import (
+    artifact_dir, artifact_stem, available_encodings, compress, source_signature,
+)
+from src.wrapper.package_projection import parse_projection, project_package
+
+logger = logging.getLogger(__name__)
+
+# === 경로 설정 ===
+BASE_DIR = Path(__file__).resolve().parents[2]
+QUIZ_PACKAGE_DIR = BASE_DIR / "data" / "quiz" / "package"
+ARTIFACT_DIR = artifact_dir(QUIZ_PACKAGE_DIR)
+
+# === 캐시 크기 (파일 단위 LRU) ===
+MAX_FILE_ENTRIES = int(os.getenv("PACKAGE_CACHE_MAX_FILES", "64"))
+MAX_MERGED_ENTRIES = int(os.getenv("PACKAGE_CACHE_MAX_MERGED", "8"))
+MAX_FRAGMENT_ENTRIES = int(os.getenv("PACKAGE_CACHE_MAX_FRAGMENTS", "512"))
+
+
+# === 패키지 파일명 규칙: {topic}_{date}_package.json ===
+PACKAGE_NAME_RE = re.compile(r"^(?P<topic>[a-z]+)_(?P<date>\d{4}-\d{2}-\d{2})_package\.json$")
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+class PackageRef(NamedTuple):
+    """패키지 인덱스 항목 (날짜 → 토픽 순 정렬)"""
+    date: str
+    topic: str
+    path: Path
+
+
+def encode_cursor(ref: PackageRef) -> str:
+    """마지막으로 내려준 (date, topic)을 불투명 커서 문자열로 인코딩"""
+    raw = json.dumps([ref.date, ref.topic], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """커서 문자열 → (date, topic). 형식이 잘못되면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        date, topic = json.loads(raw)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(date, str) or not isinstance(topic, str) or not DATE_RE.match(date):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return date, topic
+
+
+def with_fields(body: bytes, fields: dict) -> bytes:
+    """{"courses": [...]} 응답 바이트 끝에 추가 필드를 덧붙임"""
+    return body[:-1] + b"," + dump_bytes(fields)[1:]
+
+
+def negotiate_encoding(accept_encoding: str = None) -> str:
+    """Accept-Encoding 헤더 기준 br > gzip > identity 순으로 선택 (q=0은 제외)"""
+    if not accept_encoding:
+        return "identity"
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[token.strip().lower()] = q
+
+    for encoding in available_encodings():
+        if weights.get(encoding, weights.get("*", 0.0)) > 0:
+            return encoding
+    return "identity"
+
+
+def dump_bytes(data) -> bytes:
+    """JSONResponse와 동일한 직렬화 (ensure_ascii=False, 공백 없음)"""
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def file_signature(path: Path) -> tuple:
+    """파일 경로 + mtime + size 기반 캐시 키 (재작성 시 자동 무효화)"""
+    st = path.stat()
+    return (str(path), st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+COURSES_PREFIX = b'{"courses":['
+COURSES_SUFFIX = b"]}"
+
+
+def _join_items(parts) -> bytes:
+    """{"courses": [...]} 응답 바이트 조립 (빈 조각은 건너뜀)"""
+    return COURSES_PREFIX + b",".join(p for p in parts if p) + COURSES_SUFFIX
+
+
+def _strip_list(body: bytes) -> bytes:
+    """직렬화된 리스트 바이트에서 대괄호를 벗겨 원소 조각만 반환"""
+    return body[1:-1]
+
+
+class CachedBody:
+    """응답 바이트 + 인코딩별 압축본 (사전 생성본은 디스크에서, 없으면 최초 요청 시 1회 압축 후 보관).
+    본문은 처음 필요할 때 읽으므로 304 응답은 본문을 읽지 않음"""
+
+    def __init__(self, body: bytes = None, encoded_paths: dict = None, loader=None,
+                 sha256: str = None, last_modified_ns: int = None):
+        self._body = body
+        self._loader = loader
+        self._encoded_paths = encoded_paths or {}
+        self._encoded = {}
+        self._sha256 = sha256
+        self.last_modified_ns = last_modified_ns
+        self._lock = threading.Lock()
+
+    @property
+    def body(self) -> bytes:
+        if self._body is None:
+            with self._lock:
+                if self._body is None:
+                    self._body = self._loader()
+        return self._body
+
+    @property
+    def sha256(self) -> str:
+        """사전 계산된 해시(wrapper manifest)가 없을 때만 최초 1회 계산"""
+        if self._sha256 is None:
+            self._sha256 = hashlib.sha256(self.body).hexdigest()
+        return self._sha256
+
+    def etag(self, encoding: str = "identity") -> str:
+        """강한 ETag - 인코딩별로 다른 바이트이므로 접미사로 구분"""
+        suffix = "" if encoding == "identity" else f"-{encoding}"
+        return f'"{self.sha256[:32]}{suffix}"'
+
+    def last_modified(self) -> "str | None":
+        if self.last_modified_ns is None:
+            return None
+        return formatdate(self.last_modified_ns / 1e9, usegmt=True)
+
+    def is_not_modified(self, if_none_match: str = None, if_modified_since: str = None) -> bool:
+        """조건부 요청 판정 (If-None-Match 우선, 없으면 If-Modified-Since)"""
+        if if_none_match:
+            base = self.sha256[:32]
+            for tag in if_none_match.split(","):
+                tag = tag.strip()
+                if tag == "*":
+                    return True
+                if tag.startswith("W/"):
+                    tag = tag[2:]
+                tag = tag.strip('"')
+                if tag == base or tag.startswith(f"{base}-"):
+                    return True
+            return False
+
+        if if_modified_since and self.last_modified_ns is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.last_modified_ns // 1_000_000_000) <= since
+        return False
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding == "identity":
+            return self.body
+
+        with self._lock:
+            data = self._encoded.get(encoding)
+            if data is None:
+                path = self._encoded_paths.get(encoding)
+                try:
+                    data = path.read_bytes() if path is not None else None
+                except FileNotFoundError:
+                    data = None
+                if data is None:
+                    data = compress(self.body, encoding)
+                self._encoded[encoding] = data
+        return data
+
+
+def read_manifest(stem: str, sources: list) -> "dict | None":
+    """wrapper가 배포한 산출물 manifest 로드. 원본 패키지가 바뀌었으면(stale) None"""
+    manifest_path = ARTIFACT_DIR / f"{stem}.manifest.json"
+    try:
+        manifest = json.loads(manifest_path.read_bytes())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if manifest.get("sources") != [source_signature(p) for p in sources]:
+        logger.info("package_cache stale artifact stem=%s", stem)
+        return None
+
+    identity = manifest.get("files", {}).get("identity")
+    if not identity or not (ARTIFACT_DIR / identity["name"]).exists():
+        return None
+    return manifest
+
+
+def _read_range(path: Path, offset: int, length: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(length)
+
+
+def load_artifact(stem: str, sources: list) -> "CachedBody | None":
+    """사전 직렬화/압축 산출물을 CachedBody로 (본문은 지연 로드)"""
+    manifest = read_manifest(stem, sources)
+    if manifest is None:
+        return None
+
+    files = manifest["files"]
+    encoded_paths = {
+        encoding: ARTIFACT_DIR / info["name"]
+        for encoding, info in files.items()
+        if encoding != "identity"
+    }
+    return CachedBody(
+        loader=(ARTIFACT_DIR / files["identity"]["name"]).read_bytes,
+        encoded_paths=encoded_paths,
+        sha256=manifest.get("sha256"),
+        last_modified_ns=max(src["mtime_ns"] for src in manifest["sources"]) if sources else None,
+    )
+
+
+class PackageFormatError(ValueError):
+    """패키지 JSON 파싱 실패 (파일명 포함)"""
+
+    def __init__(self, path: Path):
+        super().__init__(f"Invalid JSON format: {path.name}")
+        self.path = path
+
+
+class PackageEntry:
+    """패키지 파일 1개(+프로젝션)의 사전 직렬화 조각.
+    wrapper 산출물이 유효하면 JSON 파싱 없이 바이트를 그대로 쓰고, 파싱 결과(data)는 필요할 때만 만듦"""
+
+    def __init__(self, path: Path, signature: tuple, projection: str = None):
+        self.path = path
+        self.signature = signature
+        self.projection = projection
+        self._data = None
+
+        body = None
+        manifest = read_manifest(artifact_stem(path.stem, projection), [path])
+        if manifest is not None:
+            try:
+                body = (ARTIFACT_DIR / manifest["files"]["identity"]["name"]).read_bytes()
+            except FileNotFoundError:
+                body = None
+
+        if body is not None and body.startswith(COURSES_PREFIX) and body.endswith(COURSES_SUFFIX):
+            self.today_items = body
+            self.courses_items = body[len(COURSES_PREFIX):-len(COURSES_SUFFIX)]
+            return
+
+        data = self.data
+
+        # /today: 리스트면 원소들을, 그 외에는 파일 전체를 한 원소로 이어붙임
+        if isinstance(data, list):
+            self.today_items = _strip_list(dump_bytes(data))
+        else:
+            self.today_items = dump_bytes(data)
+
+        # /packages/all: {"courses": [...]}는 courses 원소들을 펼쳐서 이어붙임
+        if isinstance(data, dict) and isinstance(data.get("courses"), list):
+            self.courses_items = _strip_list(dump_bytes(data["courses"]))
+        else:
+            self.courses_items = self.today_items
+
+    @property
+    def data(self):
+        """파싱 + 프로젝션 적용 결과 (최초 접근 시 1회)"""
+        if self._data is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as fp:
+                    raw = json.load(fp)
+            except json.JSONDecodeError as e:
+                raise PackageFormatError(self.path) from e
+            self._data = project_package(raw, *parse_projection(self.projection))
+        return self._data
+
+
+class PackageCache:
+    """프로세스 전역 패키지 캐시 (경로 + mtime/size 키, 스레드 안전)"""
+
+    def __init__(self, max_files: int = MAX_FILE_ENTRIES, max_merged: int = MAX_MERGED_ENTRIES):
+        self.max_files = max_files
+        self.max_merged = max_merged
+        self._files: "OrderedDict[str, PackageEntry]" = OrderedDict()
+        self._merged: "OrderedDict[tuple, CachedBody]" = OrderedDict()
+        self._listing: dict = {}
+        self._manifests: dict = {}
+        self._fragments: "OrderedDict[tuple, CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # === 디렉토리 목록 (디렉토리 mtime 변경 시에만 재탐색) ===
+    def list_files(self, directory: Path, pattern: str) -> list:
+        try:
+            dir_mtime = directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+
+        key = (str(directory), pattern)
+        with self._lock:
+            cached = self._listing.get(key)
+            if cached and cached[0] == dir_mtime:
+                return cached[1]
+
+        files = sorted(directory.glob(pattern))
+        with self._lock:
+            self._listing[key] = (dir_mtime, files)
+        return files
+
+    # === 패키지 인덱스 (파일명 기반, 디렉토리 변경 시에만 재구성) ===
+    def list_packages(self, directory: Path = QUIZ_PACKAGE_DIR) -> list:
+        return self._package_index(directory)[0]
+
+    def _package_index(self, directory: Path = QUIZ_PACKAGE_DIR) -> tuple:
+        files = self.list_files(directory, "*_package.json")
+        key = ("index", str(directory))
+        with self._lock:
+            cached = self._listing.get(key)
+            if cached and cached[0] is files:
+                return cached[1], cached[2]
+
+        refs = []
+        for f in files:
+            m = PACKAGE_NAME_RE.match(f.name)
+            if not m:
+                logger.warning("package_cache skip unrecognized file=%s", f.name)
+                continue
+            refs.append(PackageRef(m.group("date"), m.group("topic"), f))
+        refs.sort(key=lambda r: (r.date, r.topic))
+        keys = [(r.date, r.topic) for r in refs]
+
+        with self._lock:
+            self._listing[key] = (files, refs, keys)
+        return refs, keys
+
+    def select(self, date_from: str = None, date_to: str = None,
+               after: tuple = None, limit: int = None) -> tuple:
+        """날짜 범위 + 커서 이후 패키지 목록 반환 → (refs, 다음 페이지 존재 여부)"""
+        refs, keys = self._package_index()
+
+        start = 0
+        if date_from:
+            start = bisect.bisect_left(keys, (date_from, ""))
+        if after:
+            start = max(start, bisect.bisect_right(keys, tuple(after)))
+        end = len(refs)
+        if date_to:
+            end = bisect.bisect_right(keys, (date_to, "\uffff"))
+
+        selected = refs[start:end]
+        if limit is not None and len(selected) > limit:
+            return selected[:limit], True
+        return selected, False
+
+    # === 파일 단위 조회 ===
+    def get(self, path: Path, signature: tuple = None, projection: str = None) -> PackageEntry:
+        if signature is None:
+            signature = file_signature(path)
+
+        key = (str(path), projection)
+        with self._lock:
+            entry = self._files.get(key)
+            if entry is not None and entry.signature == signature:
+                self._files.move_to_end(key)
+                return entry
+
+        logger.info("package_cache load file=%s projection=%s", path, projection)
+        entry = PackageEntry(path, signature, projection)
+
+        with self._lock:
+            self._files[key] = entry
+            self._files.move_to_end(key)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+        return entry
+
+    # === 코스/세션 단위 조회 (wrapper 오프셋 인덱스 → 해당 바이트 구간만 읽음) ===
+    def package_manifest(self, path: Path, projection: str = None) -> "dict | None":
+        signature = file_signature(path)
+        key = (str(path), projection)
+        with self._lock:
+            cached = self._manifests.get(key)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+        manifest = read_manifest(artifact_stem(path.stem, projection), [path])
+        with self._lock:
+            self._manifests[key] = (signature, manifest)
+        return manifest
+
+    def fragment(self, path: Path, course_id: int, session_id: int = None,
+                 projection: str = None) -> "CachedBody | None":
+        """코스 1개 또는 세션 1개의 JSON 바이트. 없으면 None (압축본 재사용을 위해 LRU 보관)"""
+        key = (file_signature(path), projection, course_id, session_id)
+        with self._lock:
+            cached = self._fragments.get(key)
+            if cached is not None:
+                self._fragments.move_to_end(key)
+                return cached
+
+        cached = self._load_fragment(path, course_id, session_id, projection)
+        if cached is not None:
+            with self._lock:
+                self._fragments[key] = cached
+                while len(self._fragments) > MAX_FRAGMENT_ENTRIES:
+                    self._fragments.popitem(last=False)
+        return cached
+
+    def _load_fragment(self, path: Path, course_id: int, session_id: int = None,
+                       projection: str = None) -> "CachedBody | None":
+        manifest = self.package_manifest(path, projection)
+        index = manifest.get("fragments") if manifest else None
+
+        if index is not None:
+            info = index.get(str(course_id))
+            if info is not None and session_id is not None:
+                info = info["sessions"].get(str(session_id))
+            if info is None:
+                return None
+            body_path = ARTIFACT_DIR / manifest["files"]["identity"]["name"]
+            return CachedBody(
+                loader=lambda: _read_range(body_path, info["offset"], info["length"]),
+                sha256=info["sha256"],
+                last_modified_ns=manifest["sources"][0]["mtime_ns"],
+            )
+
+        # 인덱스가 없는 과거 패키지: 캐시된 파싱 결과에서 탐색
+        entry = self.get(path, projection=projection)
+        data = entry.data
+        courses = data.get("courses", []) if isinstance(data, dict) else data
+        for course in courses if isinstance(courses, list) else []:
+            if not isinstance(course, dict) or str(course.get("courseId")) != str(course_id):
+                continue
+            if session_id is None:
+                return CachedBody(dump_bytes(course), last_modified_ns=entry.signature[1])
+            for session in course.get("sessions", []):
+                if str(session.get("sessionId")) == str(session_id):
+                    return CachedBody(dump_bytes(session), last_modified_ns=entry.signature[1])
+        return None
+
+    def peek_or_load(self, path: Path, projection: str = None) -> PackageEntry:
+        """캐시에 유효한 항목이 있으면 사용, 없으면 캐시에 넣지 않고 1회성으로 로드"""
+        signature = file_signature(path)
+        with self._lock:
+            entry = self._files.get((str(path), projection))
+            if entry is not None and entry.signature == signature:
+                return entry
+        return PackageEntry(path, signature, projection)
+
+    def validate(self, files: list, projection: str = None):
+        """스트리밍 응답 시작 전 검사 - 파싱할 수 없는 파일이 있으면 PackageFormatError (200 응답 도중 끊김 방지).
+        캐시에 있거나 wrapper 산출물이 유효한 파일은 건너뛰고, 나머지는 1개씩 파싱만 해 보고 버림 (피크 메모리 = 파일 1개)"""
+        for f in files:
+            signature = file_signature(f)
+            with self._lock:
+                entry = self._files.get((str(f), projection))
+            if entry is not None and entry.signature == signature:
+                continue
+            if read_manifest(artifact_stem(f.stem, projection), [f]) is not None:
+                continue
+            try:
+                with open(f, "r", encoding="utf-8") as fp:
+                    json.load(fp)
+            except json.JSONDecodeError as e:
+                raise PackageFormatError(f) from e
+
+    def iter_merged(self, files: list, mode: str, fields: dict = None, projection: str = None):
+        """파일 1개씩 {"courses": [...]} 응답을 조각 단위로 생성 (피크 메모리 = 파일 1개)"""
+        yield COURSES_PREFIX
+        first = True
+        for f in files:
+            entry = self.peek_or_load(f, projection)
+            part = entry.today_items if mode == "today" else entry.courses_items
+            del entry
+            if not part:
+                continue
+            if not first:
+                yield b","
+            first = False
+            yield part
+        if fields:
+            yield b"]," + dump_bytes(fields)[1:]
+        else:
+            yield b"]}"
+
+    # === 여러 파일 통합 응답 ===
+    def merged(self, files: list, mode: str, fields: dict = None, artifact: str = None,
+               projection: str = None) -> CachedBody:
+        """mode="today" → 파일 단위 원소, mode="courses" → courses 펼침.
+        artifact가 주어지면 wrapper가 미리 만든 산출물을 우선 사용"""
+        signatures = tuple(file_signature(f) for f in files)
+        key = (mode, projection, signatures, json.dumps(fields, sort_keys=True) if fields else None)
+
+        with self._lock:
+            cached = self._merged.get(key)
+            if cached is not None:
+                self._merged.move_to_end(key)
+                return cached
+
+        cached = load_artifact(artifact, files) if artifact and not fields else None
+        if cached is not None:
+            logger.info("package_cache artifact hit stem=%s", artifact)
+        else:
+            entries = [self.get(f, sig, projection) for f, sig in zip(files, signatures)]
+            if mode == "today":
+                body = _join_items(e.today_items for e in entries)
+            else:
+                body = _join_items(e.courses_items for e in entries)
+            if fields:
+                body = with_fields(body, fields)
+            cached = CachedBody(body, last_modified_ns=max(sig[1] for sig in signatures))
+            logger.info(
+                "package_cache build mode=%s projection=%s file_count=%d bytes=%d",
+                mode,
+                projection,
+                len(entries),
+                len(body),
+            )
+
+        with self._lock:
+            self._merged[key] = cached
+            while len(self._merged) > self.max_merged:
+                self._merged.popitem(last=False)
+        return cached
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+            self._merged.clear()
+            self._listing.clear()
+            self._manifests.clear()
+            self._fragments.clear()
+
+
+# === 프로세스 전역 인스턴스 ===
+package_cache = PackageCache()
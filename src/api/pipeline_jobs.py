@@ -0,0 +1,150 @@
+# === src/api/pipeline_jobs.py ===
+# 스케줄 파이프라인 실행기: subprocess(기본) / thread 모드
+# subprocess 모드는 src.pipeline.worker를 별도 프로세스로 띄워 임베딩·클러스터링 CPU 부하와
+# 크래시·메모리 누수가 서빙 프로세스(GIL)에 영향을 주지 않도록 하고, JSON Lines 보고를 받아 상태로 유지
+import os, sys, json, time, asyncio, logging
+from collections import deque
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+EXECUTION_MODES = ("subprocess", "thread")
+
+
+class PipelineJobState:
+    """최근 파이프라인 실행 상태 (GET /api/pipeline/status)"""
+
+    def __init__(self, max_events: int = 200):
+        self.status = "idle"            # idle | running | succeeded | failed
+        self.mode = None
+        self.pid = None
+        self.started_at = None
+        self.finished_at = None
+        self.stage = None
+        self.result = None
+        self.error = None
+        self.events = deque(maxlen=max_events)
+
+    def begin(self, mode: str):
+        self.status, self.mode = "running", mode
+        self.pid = self.finished_at = self.stage = self.result = self.error = None
+        self.started_at = time.time()
+        self.events.clear()
+
+    def record(self, event: dict):
+        self.events.append(event)
+        kind = event.get("event")
+        if kind == "started":
+            self.pid = event.get("pid")
+        elif kind == "progress":
+            self.stage = event.get("stage")
+        elif kind == "completed":
+            self.result = event.get("result")
+        elif kind == "failed":
+            self.error = event.get("error")
+
+    def finish(self, ok: bool, error: str = None):
+        self.status = "succeeded" if ok else "failed"
+        self.finished_at = time.time()
+        if error and not self.error:
+            self.error = error
+
+    def snapshot(self) -> dict:
+        end = self.finished_at or time.time()
+        return {
+            "status": self.status,
+            "mode": self.mode,
+            "pid": self.pid,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "elapsed": round(end - self.started_at, 1) if self.started_at else None,
+            "stage": self.stage,
+            "result": self.result,
+            "error": self.error,
+            "events": list(self.events),
+        }
+
+
+pipeline_state = PipelineJobState()
+
+
+def execution_mode() -> str:
+    mode = os.getenv("PIPELINE_EXECUTION_MODE", "subprocess")
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"지원하지 않는 파이프라인 실행 방식: {mode} (subprocess | thread)")
+    return mode
+
+
+def _run_in_thread_sync(on_progress):
+    """파이프라인 import도 이벤트 루프 밖(스레드)에서 수행"""
+    from src.pipeline.pipeline import run_learning_pipeline
+    return run_learning_pipeline(on_progress=on_progress)
+
+
+async def _run_in_thread(state: PipelineJobState):
+    loop = asyncio.get_running_loop()
+
+    def on_progress(stage, info):
+        event = {"event": "progress", "ts": time.time(), "stage": stage, **info}
+        loop.call_soon_threadsafe(state.record, event)
+
+    result = await asyncio.to_thread(_run_in_thread_sync, on_progress)
+    state.record({"event": "completed", "ts": time.time(), "result": result})
+
+
+async def _run_in_subprocess(state: PipelineJobState):
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "src.pipeline.worker",
+        cwd=str(BASE_DIR),
+        stdout=asyncio.subprocess.PIPE,
+        # 파이프라인 로그(stderr)는 서버 로그로 그대로 출력
+        stderr=None,
+        limit=2 ** 20,
+    )
+    logger.info("파이프라인 워커 프로세스 시작 (pid=%s)", proc.pid)
+    try:
+        async for raw in proc.stdout:
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("파이프라인 워커 보고 형식 오류: %s", line[:200])
+                continue
+            state.record(event)
+            if event.get("event") == "progress":
+                logger.info("파이프라인 진행: %s", {k: v for k, v in event.items() if k not in ("event", "ts")})
+        returncode = await proc.wait()
+    except asyncio.CancelledError:
+        # 서버 종료 등으로 잡이 취소되면 워커도 정리
+        if proc.returncode is None:
+            proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), 30)
+            except asyncio.TimeoutError:
+                proc.kill()
+        raise
+
+    if returncode != 0:
+        raise RuntimeError(f"파이프라인 워커 비정상 종료 (exit={returncode}): {state.error}")
+
+
+async def run_pipeline_job(state: PipelineJobState = pipeline_state):
+    """설정된 방식으로 파이프라인 1회 실행. 실패 시 예외 전파 (스케줄러 리스너가 기록)"""
+    if state.status == "running":
+        raise RuntimeError("파이프라인이 이미 실행 중입니다.")
+
+    mode = execution_mode()
+    state.begin(mode)
+    try:
+        if mode == "subprocess":
+            await _run_in_subprocess(state)
+        else:
+            await _run_in_thread(state)
+    except BaseException as exc:
+        state.finish(False, f"{type(exc).__name__}: {exc}")
+        raise
+    state.finish(True)
+    return state.result
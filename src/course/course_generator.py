@@ -2,6 +2,7 @@
 import os
 import json
 import re
+import sys
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -11,8 +12,9 @@ import yaml
 import numpy as np
 from dotenv import load_dotenv
 from openai import OpenAI
-from sentence_transformers import SentenceTransformer
 from k_means_constrained import KMeansConstrained
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from quiz.embedding import get_embedder
 
 logger = logging.getLogger(__name__)
 
@@ -111,7 +113,7 @@ def generate_all_courses():
             return
 
         # --- 임베딩 생성 ---
-        st_model = SentenceTransformer("jhgan/ko-sroberta-multitask")
+        st_model = get_embedder()
         embeddings = st_model.encode(texts_for_embedding, convert_to_numpy=True)
 
         # --- 언론사 리스트 ---
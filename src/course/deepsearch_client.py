@@ -0,0 +1,110 @@
+# === src/course/deepsearch_client.py ===
+# DeepSearch 기사 API 비동기 클라이언트: 커넥션 풀 공유 + 토큰 버킷 속도 제한 + 지터 백오프 재시도
+import os, time, random, asyncio, logging
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEEPSEARCH_BASE_URL = "https://api-v2.deepsearch.com/v1/articles"
+
+# 재시도 대상 HTTP 상태 (속도 제한 / 일시적 서버 오류)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """초당 rate개 토큰을 채우고 최대 capacity개까지 몰아 쓸 수 있는 비동기 속도 제한기"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def penalize(self, seconds: float):
+        """429 Retry-After 동안 토큰 지급을 멈춤 (다른 토픽 요청도 함께 늦춤)"""
+        self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+class DeepSearchClient:
+    """async with DeepSearchClient.from_env(api_key) as client: await client.articles(topic, params)"""
+
+    def __init__(self, api_key: str, rate: float = 5.0, burst: float = 5.0, max_connections: int = 8,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 timeout: float = 15.0):
+        self.api_key = api_key
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._client = httpx.AsyncClient(
+            base_url=DEEPSEARCH_BASE_URL,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout, connect=5.0),
+        )
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    @classmethod
+    def from_env(cls, api_key: str) -> "DeepSearchClient":
+        """DEEPSEARCH_RATE_PER_SEC / DEEPSEARCH_BURST / DEEPSEARCH_MAX_CONNECTIONS / DEEPSEARCH_MAX_RETRIES"""
+        return cls(
+            api_key,
+            rate=float(os.getenv("DEEPSEARCH_RATE_PER_SEC", "5")),
+            burst=float(os.getenv("DEEPSEARCH_BURST", "5")),
+            max_connections=int(os.getenv("DEEPSEARCH_MAX_CONNECTIONS", "8")),
+            max_retries=int(os.getenv("DEEPSEARCH_MAX_RETRIES", "3")),
+            timeout=float(os.getenv("DEEPSEARCH_TIMEOUT", "15")),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+
+    def _backoff(self, attempt: int, retry_after: str = None) -> float:
+        """Retry-After 우선, 없으면 full-jitter 지수 백오프"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max * 4)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def articles(self, topic: str, params: dict) -> dict:
+        """GET /v1/articles/{topic} - 재시도 후에도 실패하면 예외 전파"""
+        params = {"api_key": self.api_key, **params}
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            self.stats["requests"] += 1
+            try:
+                resp = await self._client.get(f"/{topic}", params=params)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    self.stats["failures"] += 1
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"[{topic}] DeepSearch 연결 오류 ({e!r}) → {delay:.1f}초 후 재시도")
+            else:
+                if resp.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                    if resp.is_error:
+                        self.stats["failures"] += 1
+                    resp.raise_for_status()
+                    return resp.json()
+                delay = self._backoff(attempt, resp.headers.get("Retry-After"))
+                if resp.status_code == 429:
+                    self.bucket.penalize(delay)
+                logger.warning(f"[{topic}] DeepSearch HTTP {resp.status_code} → {delay:.1f}초 후 재시도")
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
@@ -1,13 +1,18 @@
 # === src/course/news_api.py ===
-import os, re, requests, json, logging, time
+import os, re, sys, json, asyncio, logging
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import datetime
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from course.deepsearch_client import DeepSearchClient
+from course.near_dup import NearDupIndex
 
 logger = logging.getLogger(__name__)
 
-def fetch_news(date_from: str = None, date_to: str = None, max_per_topic: int = 100):
-    """ FastAPI 백엔드 파이프라인에서 호출 시 전체 초기화 → 뉴스 수집 → 저장까지 실행되는 함수 """
+def fetch_news(date_from: str = None, date_to: str = None, max_per_topic: int = 100, incremental: bool = None):
+    """ FastAPI 백엔드 파이프라인에서 호출 시 전체 초기화 → 뉴스 수집 → 저장까지 실행되는 함수
+    incremental=True (없으면 NEWS_FETCH_INCREMENTAL=1) 이면 토픽별 워터마크 이후의 새 기사만 받아
+    오늘 백업 파일 앞쪽에 추가 (하루 중 여러 번 갱신용) """
 
     # === 날짜 정의 ===
     today = datetime.now().strftime("%Y-%m-%d")
@@ -17,6 +22,11 @@ def fetch_news(date_from: str = None, date_to: str = None, max_per_topic: int =
     ENV_PATH = BASE_DIR / ".env"
     BACKUP_DIR = BASE_DIR / "data" / "backup"
     BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    # 워터마크는 하위 폴더에 저장 → 백업 파일 glob(*_{today}.json)에 섞이지 않음
+    WATERMARK_PATH = BACKUP_DIR / "watermarks" / f"news_{today}.json"
+
+    if incremental is None:
+        incremental = os.getenv("NEWS_FETCH_INCREMENTAL", "0") == "1"
 
     # === 환경 변수 로드 ===
     load_dotenv(dotenv_path=ENV_PATH, override=True)
@@ -33,12 +43,14 @@ def fetch_news(date_from: str = None, date_to: str = None, max_per_topic: int =
         total_chars = len(text)
         return (korean_chars / total_chars) >= threshold if total_chars > 0 else False
 
-    # === DeepSearch API 호출 ===
-    def deepsearch_query(endpoint: str, subTopic: str, date_from: str, date_to: str,
-                        page: int = 1, page_size: int = 100, order="published_at", direction="desc"):
+    # === 다음 페이지 미리 요청 수 (현재 페이지를 처리하는 동안 받아 둠) ===
+    PREFETCH_PAGES = int(os.getenv("DEEPSEARCH_PREFETCH_PAGES", "1"))
+
+    # === DeepSearch API 호출 (공유 커넥션 풀 + 토큰 버킷 + 재시도) ===
+    async def deepsearch_query(client: DeepSearchClient, topic: str, subTopic: str, date_from: str, date_to: str,
+                               page: int = 1, page_size: int = 100, order="published_at", direction="desc"):
         query = f"({subTopic})"
         params = {
-            "api_key": DEEPSEARCH_API_KEY,
             "q": query,
             "page": page,
             "page_size": page_size,
@@ -47,9 +59,7 @@ def fetch_news(date_from: str = None, date_to: str = None, max_per_topic: int =
             "order": order,
             "direction": direction,
         }
-        resp = requests.get(endpoint, params=params)
-        resp.raise_for_status()
-        return resp.json()
+        return await client.articles(topic, params)
 
     # === key 정렬 ===
     def sort_session_keys(session: dict) -> dict:
@@ -66,97 +76,188 @@ def fetch_news(date_from: str = None, date_to: str = None, max_per_topic: int =
         )
         return dict(ordered + remaining)
 
+    # === 제목 정규화 (제목 중복 필터용) ===
+    def normalize_title(title: str) -> str:
+        if not title:
+            return ""
+        title = re.sub(r"[^가-힣A-Za-z0-9 ]", "", title)
+        title = re.sub(r"\s+", " ", title).strip()
+        return title.lower()
+
+    # === 워터마크 (토픽별 최신 published_at + 그 시각의 기사 ID) ===
+    # published_at은 DeepSearch가 같은 ISO 형식으로 내려주므로 문자열 비교로 선후 판단
+    def load_watermarks() -> dict:
+        if not WATERMARK_PATH.exists():
+            return {}
+        try:
+            with open(WATERMARK_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"워터마크 파일 읽기 실패 → 백업 기준으로 재계산: {e}")
+            return {}
+
+    def save_watermarks(watermarks: dict):
+        WATERMARK_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = WATERMARK_PATH.with_name(f".{WATERMARK_PATH.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(watermarks, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, WATERMARK_PATH)
+
+    def watermark_from_articles(articles: list):
+        """워터마크 파일이 없을 때 기존 백업 기사로 대체"""
+        published = [a.get("publishedAt") for a in articles if a.get("publishedAt")]
+        if not published:
+            return None
+        latest = max(published)
+        return {
+            "publishedAt": latest,
+            "ids": [a.get("deepsearchId") for a in articles if a.get("publishedAt") == latest],
+        }
+
+    def load_backup(topic: str) -> list:
+        backup_file = BACKUP_DIR / f"{topic}_{today}.json"
+        if not backup_file.exists():
+            return []
+        try:
+            with open(backup_file, "r", encoding="utf-8") as f:
+                return json.load(f).get("articles", [])
+        except (OSError, ValueError) as e:
+            logger.warning(f"[{topic}] 기존 백업 읽기 실패 → 전체 수집으로 진행: {e}")
+            return []
+
     # === 기사 수집 함수 ===
-    def collect_articles_with_filter(topic: str, subTopic: str,
-                                    date_from: str, date_to: str,
-                                    seen_ids: set,
-                                    min_length: int = 250, target_samples: int = 70,
-                                    max_pages: int = 50):
+    async def collect_articles_with_filter(client: DeepSearchClient, topic: str, subTopic: str,
+                                           date_from: str, date_to: str,
+                                           seen_ids: set,
+                                           min_length: int = 250, target_samples: int = 70,
+                                           max_pages: int = 50,
+                                           seen_titles: set = None, watermark: dict = None):
         """
         중복 제거 강화 버전
         전역 seen_ids를 이용해 중복 기사 완전 차단
+        페이지는 순서대로 처리하되, 처리 중에 다음 페이지(PREFETCH_PAGES개)를 미리 요청
+        watermark가 있으면 그보다 오래된 기사에 도달하는 즉시 페이지 요청 중단
+        → (수집 기사, 새 워터마크) 반환. 워터마크는 "이 시각 이후 기사는 모두 처리함"을 뜻하므로
+          중간 페이지 오류, 또는 기존 워터마크까지 내려가기 전에 목표 수량/최대 페이지로 멈춘 경우는 유지
+        요약 유사 중복(통신사 재작성 등)은 토픽 수집이 모두 끝난 뒤 drop_near_duplicates에서 고정 순서로 제외
         """
-        endpoint = f"https://api-v2.deepsearch.com/v1/articles/{topic}"
         collected = []
-        seen_titles = set()
+        seen_titles = set() if seen_titles is None else seen_titles
+        mark_at = watermark["publishedAt"] if watermark else ""
+        mark_ids = set(watermark["ids"]) if watermark else set()
+        high_at, high_ids = mark_at, set(mark_ids)
+        page_failed = False
+        reached_mark = False
+        reached_end = False
 
-        def normalize_title(title: str) -> str:
-            if not title:
-                return ""
-            title = re.sub(r"[^가-힣A-Za-z0-9 ]", "", title)
-            title = re.sub(r"\s+", " ", title).strip()
-            return title.lower()
-
-        for page in range(1, max_pages + 1):
-            try:
-                resp = deepsearch_query(
-                    endpoint,
-                    subTopic=subTopic,
-                    date_from=date_from,
-                    date_to=date_to,
-                    page=page,
-                    page_size=target_samples,
-                    order="published_at",
-                    direction="desc"
-                )
-            except Exception as e:
-                logger.warning(f"[{topic}] {page}페이지 수집 중 오류 발생: {e}")
-                continue
-
-            articles = resp.get("data", [])
-            if not articles:
-                break
-
-            for a in articles:
-                article_id = a.get("id")
-                title = (a.get("title") or "").strip()
-                norm_title = normalize_title(title)
-
-                # === 1️. ID 중복 필터 ===
-                if article_id in seen_ids:
-                    continue
-                seen_ids.add(article_id)
+        def request_page(page: int) -> asyncio.Task:
+            return asyncio.ensure_future(deepsearch_query(
+                client,
+                topic,
+                subTopic=subTopic,
+                date_from=date_from,
+                date_to=date_to,
+                page=page,
+                page_size=target_samples,
+                order="published_at",
+                direction="desc"
+            ))
 
-                # === 2️. 제목 중복 필터 ===
-                if norm_title in seen_titles:
+        inflight = {}
+        next_page = 1
+        try:
+            for page in range(1, max_pages + 1):
+                # 현재 페이지 + 다음 PREFETCH_PAGES개 페이지 요청을 미리 띄워 둠
+                while next_page <= min(max_pages, page + PREFETCH_PAGES):
+                    inflight[next_page] = request_page(next_page)
+                    next_page += 1
+                try:
+                    resp = await inflight.pop(page)
+                except Exception as e:
+                    logger.warning(f"[{topic}] {page}페이지 수집 중 오류 발생: {e}")
+                    page_failed = True
                     continue
-                seen_titles.add(norm_title)
 
-                summary = (a.get("summary") or "").strip()
-                if len(summary) < min_length:
-                    continue
-                if summary.endswith("...") or summary.endswith("…"):
-                    continue
-                if not is_purely_korean(summary):
-                    continue
+                articles = resp.get("data", [])
+                if not articles:
+                    reached_end = True
+                    break
 
-                thumbnail_url = a.get("thumbnail_url")
-                if not thumbnail_url:
-                    continue
+                for a in articles:
+                    article_id = a.get("id")
+                    published_at = a.get("published_at") or ""
+
+                    # === 0. 워터마크 필터 (최신순 정렬이므로 더 오래된 기사부터는 이미 본 구간) ===
+                    if published_at < mark_at:
+                        reached_mark = True
+                        break
+                    if published_at == mark_at and article_id in mark_ids:
+                        continue
+                    if published_at > high_at:
+                        high_at, high_ids = published_at, {article_id}
+                    elif published_at == high_at:
+                        high_ids.add(article_id)
 
-                session = {
-                    "deepsearchId": article_id,
-                    "topic": topic,
-                    "subTopic": subTopic,
-                    "summary": summary,
-                    "sourceUrl": a.get("content_url"),
-                    "headline": a.get("title"),
-                    "publishedAt": a.get("published_at"),
-                    "publisher": a.get("publisher"),
-                    "thumbnailUrl": a.get("thumbnail_url")
-                }
-
-                session = sort_session_keys(session)
-                collected.append(session)
+                    title = (a.get("title") or "").strip()
+                    norm_title = normalize_title(title)
 
+                    # === 1️. ID 중복 필터 ===
+                    if article_id in seen_ids:
+                        continue
+                    seen_ids.add(article_id)
+
+                    # === 2️. 제목 중복 필터 ===
+                    if norm_title in seen_titles:
+                        continue
+                    seen_titles.add(norm_title)
+
+                    summary = (a.get("summary") or "").strip()
+                    if len(summary) < min_length:
+                        continue
+                    if summary.endswith("...") or summary.endswith("…"):
+                        continue
+                    if not is_purely_korean(summary):
+                        continue
+
+                    thumbnail_url = a.get("thumbnail_url")
+                    if not thumbnail_url:
+                        continue
+
+                    session = {
+                        "deepsearchId": article_id,
+                        "topic": topic,
+                        "subTopic": subTopic,
+                        "summary": summary,
+                        "sourceUrl": a.get("content_url"),
+                        "headline": a.get("title"),
+                        "publishedAt": a.get("published_at"),
+                        "publisher": a.get("publisher"),
+                        "thumbnailUrl": a.get("thumbnail_url")
+                    }
+
+                    session = sort_session_keys(session)
+                    collected.append(session)
+
+                    if len(collected) >= target_samples:
+                        break
+
+                if reached_mark:
+                    logger.info(f"[{topic}] 워터마크({mark_at}) 도달 → {page}페이지에서 수집 중단")
+                    break
                 if len(collected) >= target_samples:
                     break
+        finally:
+            # 목표 수량 도달/빈 페이지 등으로 중단 시 남은 선요청 취소
+            for task in inflight.values():
+                task.cancel()
+            await asyncio.gather(*inflight.values(), return_exceptions=True)
 
-            time.sleep(1)
-            if len(collected) >= target_samples:
-                break
-
-        return collected
+        covered = reached_mark or reached_end or watermark is None
+        if page_failed or not covered or not high_at:
+            if watermark and not covered:
+                logger.info(f"[{topic}] 기존 워터마크({mark_at})까지 처리하지 못함 → 워터마크 유지 (다음 실행에서 이어서 수집)")
+            return collected, watermark
+        return collected, {"publishedAt": high_at, "ids": sorted(high_ids, key=str)}
 
     # === 토픽별 subTopic 정의 ===
     TOPIC_SUBTOPICS = {
@@ -171,12 +272,23 @@ def fetch_news(date_from: str = None, date_to: str = None, max_per_topic: int =
     date_to = today
     MAX_TOPIC_TOTAL = 100
 
-    for topic, subTopics in TOPIC_SUBTOPICS.items():
-        collected_all = []
+    async def collect_topic(client: DeepSearchClient, topic: str, subTopics: str, watermark: dict,
+                            existing: list):
+        """토픽 1개 수집 → (수집 기사, 갱신된 워터마크, 백업 저장 여부)"""
         seen_ids = set()
+        seen_titles = set()
+
+        if incremental:
+            # 오늘 이미 저장한 기사로 중복 필터를 채우고, 워터마크 이후 기사만 요청
+            seen_ids.update(a.get("deepsearchId") for a in existing)
+            seen_titles.update(normalize_title((a.get("headline") or "").strip()) for a in existing)
+            watermark = watermark or watermark_from_articles(existing)
+        else:
+            watermark = None
 
         try:
-            cleaned = collect_articles_with_filter(
+            cleaned, watermark = await collect_articles_with_filter(
+                client,
                 topic=topic,
                 subTopic=subTopics,
                 date_from=date_from,
@@ -184,25 +296,99 @@ def fetch_news(date_from: str = None, date_to: str = None, max_per_topic: int =
                 seen_ids=seen_ids,
                 min_length=250,
                 target_samples=MAX_TOPIC_TOTAL,
+                seen_titles=seen_titles,
+                watermark=watermark,
             )
-            collected_all.extend(cleaned)
-            logger.info(f"[{topic}] 기사 {len(collected_all)}건 수집 완료")
+            logger.info(f"[{topic}] 기사 {len(cleaned)}건 수집 완료")
         except Exception as e:
             logger.error(f"[{topic}] 기사 수집 실패: {e}", exc_info=True)
+            # 증분 모드는 기존 백업 유지
+            return [], watermark, not incremental
+        return cleaned, watermark, True
 
-        time.sleep(2)
+    def drop_near_duplicates(collected: dict, near_dup: NearDupIndex) -> dict:
+        """토픽별 수집 기사에서 요약 유사 중복(통신사 재작성 등) 제외.
+        토픽 수집은 끝나는 순서가 실행마다 다르므로 모두 모은 뒤 (토픽, 발행 시각, 기사 ID) 순으로 판정
+        → 어느 기사를 남기고 어느 토픽에서 뺄지가 실행마다 같음 (같은 토픽 안에서는 먼저 발행된 기사를 유지)"""
+        candidates = sorted(
+            ((topic, a) for topic, articles in collected.items() for a in articles),
+            key=lambda item: (item[0], item[1].get("publishedAt") or "", str(item[1].get("deepsearchId"))),
+        )
+        dropped = set()
+        for topic, a in candidates:
+            duplicate_of = near_dup.check_and_add(a["deepsearchId"], a["summary"])
+            if duplicate_of is not None:
+                dropped.add((topic, a["deepsearchId"]))
+                logger.debug(f"[{topic}] 유사 중복 기사 제외: {a['deepsearchId']} ≈ {duplicate_of}")
+
+        result = {}
+        for topic, articles in collected.items():
+            result[topic] = [a for a in articles if (topic, a["deepsearchId"]) not in dropped]
+            if len(result[topic]) < len(articles):
+                logger.info(f"[{topic}] 유사 중복 기사 {len(articles) - len(result[topic])}건 제외")
+        return result
+
+    def save_topic(topic: str, collected_all: list, existing: list):
+        """토픽 백업 저장"""
+        if incremental and not collected_all and existing:
+            # 새 기사 없음 → 백업을 다시 쓰지 않아 이후 단계 체크포인트가 그대로 유지됨
+            logger.info(f"[{topic}] 새 기사 없음 → 기존 백업 유지 ({len(existing)}건)")
+            return
 
-        # === 저장 ===
+        # === 저장 (증분 모드는 기존 기사와 합쳐 최신순 정렬 후 토픽 상한까지만 유지) ===
+        articles = collected_all
+        if existing:
+            merged = sorted(collected_all + existing, key=lambda a: a.get("publishedAt") or "", reverse=True)
+            articles = merged[:MAX_TOPIC_TOTAL]
+            if len(merged) > MAX_TOPIC_TOTAL:
+                logger.info(f"[{topic}] 토픽 상한({MAX_TOPIC_TOTAL}건) 초과 → 오래된 기사 {len(merged) - MAX_TOPIC_TOTAL}건 제외")
         backup_file = BACKUP_DIR / f"{topic}_{today}.json"
         try:
             with open(backup_file, "w", encoding="utf-8") as f:
-                json.dump({"topic": topic, "articles": collected_all}, f, ensure_ascii=False, indent=2)
-            logger.info(f"[{topic}] 백업 저장 완료 → {backup_file.name}")
+                json.dump({"topic": topic, "articles": articles}, f, ensure_ascii=False, indent=2)
+            logger.info(f"[{topic}] 백업 저장 완료 → {backup_file.name} (신규 {len(collected_all)}건 / 전체 {len(articles)}건)")
         except Exception as e:
             logger.error(f"[{topic}] 백업 저장 실패: {e}", exc_info=True)
 
+    async def collect_all():
+        # 토픽별 수집을 동시에 실행 - 요청 속도는 공유 토큰 버킷이 제한 (고정 sleep 대체)
+        watermarks = load_watermarks() if incremental else {}
+        existing = {topic: load_backup(topic) if incremental else [] for topic in TOPIC_SUBTOPICS}
+
+        # 유사 중복 인덱스는 토픽 간 공유 - 증분 모드는 오늘 저장된 기사 전체로 먼저 채움
+        near_dup = NearDupIndex.from_env()
+        if near_dup is not None:
+            for articles in existing.values():
+                for a in articles:
+                    near_dup.add(a.get("deepsearchId"), near_dup.signature(a.get("summary") or ""))
+
+        async with DeepSearchClient.from_env(DEEPSEARCH_API_KEY) as client:
+            results = await asyncio.gather(*(
+                collect_topic(client, topic, subTopics, watermarks.get(topic), existing[topic])
+                for topic, subTopics in TOPIC_SUBTOPICS.items()
+            ))
+            logger.info(f"DeepSearch 호출 통계: {client.stats}")
+
+        collected = {topic: articles for topic, (articles, _, _) in zip(TOPIC_SUBTOPICS, results)}
+        if near_dup is not None:
+            collected = drop_near_duplicates(collected, near_dup)
+            logger.info(f"유사 중복 인덱스: {near_dup.stats}")
+        for topic, (_, _, save) in zip(TOPIC_SUBTOPICS, results):
+            if save:
+                save_topic(topic, collected[topic], existing[topic])
+
+        # 전체 수집 후에도 워터마크를 남겨 두어 이후 증분 실행이 이어받을 수 있도록 함
+        watermarks.update({topic: mark for topic, (_, mark, _) in zip(TOPIC_SUBTOPICS, results) if mark})
+        try:
+            save_watermarks(watermarks)
+        except Exception as e:
+            logger.error(f"워터마크 저장 실패: {e}", exc_info=True)
+
+    logger.info(f"뉴스 수집 모드: {'증분' if incremental else '전체'}")
+    asyncio.run(collect_all())
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     today = datetime.now().strftime("%Y-%m-%d")
-    fetch_news(date_from=today, date_to=today, max_per_topic=100)
\ No newline at end of file
+    fetch_news(date_from=today, date_to=today, max_per_topic=100,
+               incremental=True if "--incremental" in sys.argv[1:] else None)
\ No newline at end of file
@@ -0,0 +1,126 @@
+# === src/pipeline/checkpoint.py ===
+# 단계별 내용 기반(content-addressed) 체크포인트
+# 단계마다 입력 해시 + 출력 파일(sha256)을 manifest로 남기고, 재실행 시 입력이 같고 출력이 그대로면 건너뜀
+# manifest: data/checkpoints/{stage}_{today}.json (clean.py의 날짜 기준 정리 대상과 같은 규칙)
+import os, re, json, time, hashlib, logging, threading
+from pathlib import Path
+from typing import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+CHECKPOINT_DIR = BASE_DIR / "data" / "checkpoints"
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_inputs(values: Iterable) -> str:
+    """입력 값(dict/str 등)과 파일(Path → 이름 + 내용 해시)을 묶은 해시"""
+    h = hashlib.sha256()
+    for value in values:
+        if isinstance(value, Path):
+            digest = file_sha256(value) if value.exists() else "missing"
+            h.update(f"file:{value.name}:{digest}".encode())
+        else:
+            h.update(json.dumps(value, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+class CheckpointStore:
+    def __init__(self, today: str, force: Iterable[str] = (), enabled: bool = True,
+                 directory: Path = CHECKPOINT_DIR):
+        self.today = today
+        self.force = {f.strip() for f in force if f and f.strip()}
+        self.enabled = enabled
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.stats = {"ran": [], "skipped": []}
+
+    @classmethod
+    def from_env(cls, today: str, force: Iterable[str] = None) -> "CheckpointStore":
+        """PIPELINE_CHECKPOINTS_ENABLED=0 이면 항상 실행, PIPELINE_FORCE=fetch_news,term 처럼 강제 재실행 지정"""
+        if force is None:
+            force = os.getenv("PIPELINE_FORCE", "").split(",")
+        return cls(today, force=force, enabled=os.getenv("PIPELINE_CHECKPOINTS_ENABLED", "1") == "1")
+
+    def is_forced(self, stage: str) -> bool:
+        """stage 이름 전체 또는 ':' 로 나뉜 구성 요소가 force 목록에 있으면 강제 실행
+        (예: 'term' → quiz:term:* 전체, 'quiz' → 퀴즈 생성기 전체, 'all' → 모든 단계)"""
+        if "all" in self.force or stage in self.force:
+            return True
+        return any(part in self.force for part in stage.split(":"))
+
+    def _manifest_path(self, stage: str) -> Path:
+        safe = re.sub(r"[^0-9A-Za-z_.-]+", "__", stage)
+        return self.directory / f"{safe}_{self.today}.json"
+
+    def _load(self, stage: str):
+        path = self._manifest_path(stage)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, stage: str, input_hash: str) -> bool:
+        """입력 해시가 같고, 기록된 출력 파일이 모두 같은 내용으로 남아 있으면 최신"""
+        manifest = self._load(stage)
+        if not manifest or manifest.get("inputHash") != input_hash or not manifest.get("outputs"):
+            return False
+        for output in manifest["outputs"]:
+            path = BASE_DIR / output["path"]
+            if not path.exists() or file_sha256(path) != output["sha256"]:
+                return False
+        return True
+
+    def record(self, stage: str, input_hash: str, outputs: list, seconds: float):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "stage": stage,
+            "inputHash": input_hash,
+            "outputs": [
+                {"path": str(p.relative_to(BASE_DIR)), "sha256": file_sha256(p)}
+                for p in sorted(outputs) if p.exists()
+            ],
+            "seconds": round(seconds, 2),
+            "completedAt": time.time(),
+        }
+        path = self._manifest_path(stage)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def run(self, stage: str, func: Callable, inputs: Callable[[], list], outputs: Callable[[], list]):
+        """입력이 그대로면 건너뛰고(True 반환), 아니면 func 실행 후 manifest 기록(False 반환).
+        inputs/outputs는 실행 시점에 평가 (앞 단계 결과가 반영되도록)"""
+        if not self.enabled:
+            func()
+            return False
+
+        input_hash = hash_inputs(inputs())
+        if not self.is_forced(stage) and self.is_fresh(stage, input_hash):
+            logger.info(f"[checkpoint] {stage} 입력 변경 없음 → 건너뜀")
+            with self._lock:
+                self.stats["skipped"].append(stage)
+            return True
+
+        start = time.perf_counter()
+        func()
+        produced = outputs()
+        if produced:
+            self.record(stage, input_hash, produced, time.perf_counter() - start)
+        else:
+            logger.warning(f"[checkpoint] {stage} 출력 파일 없음 → 체크포인트 기록 안 함 (다음 실행 시 재시도)")
+        with self._lock:
+            self.stats["ran"].append(stage)
+        return False
@@ -0,0 +1,161 @@
+# === src/pipeline/dag.py ===
+# 퀴즈 생성기 의존성 그래프(DAG) 실행기
+# 노드 = 세션 1개에 대한 생성기 호출. 의존 노드가 끝난 노드부터 스레드 풀에서 실행하고,
+# 여러 세션의 노드도 같은 풀에서 함께 돌려 전체 소요 시간을 임계 경로 수준으로 줄임
+import os, time, logging, threading, contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Node(NamedTuple):
+    name: str
+    func: Callable            # func(session)
+    deps: tuple = ()
+    llm: bool = True          # LLM 호출 노드 → LLM 동시 실행 예산 적용 (LLM을 부르지 않는 노드는 False로 지정)
+
+
+class NodeResult(NamedTuple):
+    key: str                  # 세션 구분 키 (예: {topic}_{courseId}_{sessionId})
+    node: str
+    status: str               # ok | failed | skipped
+    seconds: float
+    error: Optional[str] = None
+
+
+def validate(nodes: list):
+    """이름 중복·없는 의존성·순환 검사"""
+    names = [n.name for n in nodes]
+    if len(names) != len(set(names)):
+        raise ValueError(f"DAG 노드 이름 중복: {names}")
+    deps = {n.name: set(n.deps) for n in nodes}
+    for name, ds in deps.items():
+        missing = ds - deps.keys()
+        if missing:
+            raise ValueError(f"[{name}] 존재하지 않는 의존 노드: {sorted(missing)}")
+
+    visited, stack = set(), set()
+
+    def visit(name):
+        if name in stack:
+            raise ValueError(f"DAG 순환 의존성: {name}")
+        if name in visited:
+            return
+        stack.add(name)
+        for d in deps[name]:
+            visit(d)
+        stack.discard(name)
+        visited.add(name)
+
+    for name in deps:
+        visit(name)
+
+
+class DagExecutor:
+    def __init__(self, nodes: list, max_workers: int = 8, llm_budget: int = 4):
+        validate(nodes)
+        self.nodes = {n.name: n for n in nodes}
+        self.max_workers = max_workers
+        self._llm_slots = threading.BoundedSemaphore(llm_budget)
+
+    @classmethod
+    def from_env(cls, nodes: list) -> "DagExecutor":
+        return cls(
+            nodes,
+            max_workers=int(os.getenv("PIPELINE_DAG_WORKERS", "8")),
+            # 기본 예산을 워커 수보다 작게 → 남는 워커는 LLM을 쓰지 않는 노드(파일 생성 등)가 사용
+            llm_budget=int(os.getenv("PIPELINE_LLM_BUDGET", "4")),
+        )
+
+    def _run_node(self, node: Node, session: dict) -> float:
+        if node.llm:
+            with self._llm_slots:
+                start = time.perf_counter()
+                node.func(session)
+        else:
+            start = time.perf_counter()
+            node.func(session)
+        return time.perf_counter() - start
+
+    def run(self, sessions: dict, on_node_done: Callable[[NodeResult], None] = None) -> list:
+        """sessions = {키: session}. 모든 세션에 같은 DAG를 적용해 동시 실행 → NodeResult 리스트.
+        sessions 순서가 우선순위 - 실행 가능한 노드 중 앞선 세션의 노드부터 워커에 배정.
+        실패한 노드에 의존하는 노드는 skipped 처리, 나머지 독립 노드는 계속 진행"""
+        priority = {key: i for i, key in enumerate(sessions)}
+        node_order = {name: i for i, name in enumerate(self.nodes)}
+        remaining = {(key, name): set(node.deps) for key in sessions for name, node in self.nodes.items()}
+        dependents = {}
+        for (key, name), deps in remaining.items():
+            for d in deps:
+                dependents.setdefault((key, d), []).append(name)
+
+        results, running = [], {}
+
+        def finish(result: NodeResult):
+            results.append(result)
+            if on_node_done is not None:
+                on_node_done(result)
+            level = logging.INFO if result.status == "ok" else logging.WARNING
+            logger.log(level, f"[{result.key}] {result.node} {result.status} ({result.seconds:.1f}s)")
+
+        def skip_dependents(key: str, name: str):
+            for child in dependents.get((key, name), []):
+                if (key, child) in remaining:
+                    del remaining[(key, child)]
+                    finish(NodeResult(key, child, "skipped", 0.0, f"의존 노드 실패: {name}"))
+                    skip_dependents(key, child)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="quiz-dag") as pool:
+            def submit_ready():
+                # 풀 대기열에 미리 쌓지 않고 빈 워커 수만큼만 배정 → 뒤늦게 준비된 상위 세션 노드가 먼저 실행
+                ready = sorted(
+                    (k for k, deps in remaining.items() if not deps),
+                    key=lambda k: (priority[k[0]], node_order[k[1]]),
+                )
+                for key, name in ready[: max(0, self.max_workers - len(running))]:
+                    del remaining[(key, name)]
+                    # 호출 측 컨텍스트(실행 단계 등)를 노드마다 복사해 워커 스레드로 전달
+                    ctx = contextvars.copy_context()
+                    future = pool.submit(ctx.run, self._run_node, self.nodes[name], sessions[key])
+                    running[future] = (key, name)
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, name = running.pop(future)
+                    try:
+                        seconds = future.result()
+                    except Exception as exc:
+                        logger.exception(f"[{key}] {name} 생성 실패")
+                        finish(NodeResult(key, name, "failed", 0.0, f"{type(exc).__name__}: {exc}"))
+                        skip_dependents(key, name)
+                        continue
+                    finish(NodeResult(key, name, "ok", seconds))
+                    for child in dependents.get((key, name), []):
+                        if (key, child) in remaining:
+                            remaining[(key, child)].discard(name)
+                submit_ready()
+
+        return results
+
+
+def critical_path_seconds(nodes: list, results: list) -> dict:
+    """세션별 임계 경로 시간 (노드 소요 시간 기준) - 병렬 실행 시 이론상 최소 소요 시간"""
+    by_key = {}
+    for r in results:
+        by_key.setdefault(r.key, {})[r.node] = r.seconds
+    deps = {n.name: n.deps for n in nodes}
+
+    paths = {}
+    for key, seconds in by_key.items():
+        memo = {}
+
+        def longest(name):
+            if name not in memo:
+                memo[name] = seconds.get(name, 0.0) + max((longest(d) for d in deps[name]), default=0.0)
+            return memo[name]
+
+        paths[key] = round(max((longest(n) for n in deps), default=0.0), 1)
+    return paths
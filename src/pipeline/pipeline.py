@@ -1,12 +1,16 @@
 # === src/pipeline/pipeline.py ===
 
-import sys, logging
+import os, sys, time, logging, argparse
+from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
 # === 경로 설정 ===
 BASE_DIR = Path(__file__).resolve().parents[2]
 sys.path.append(str(BASE_DIR / "src"))
+# 파이프라인 내부 모듈은 src.pipeline.* 로 import
+# (python src/pipeline/pipeline.py 로 실행하면 sys.path[0]이 src/pipeline 이라 "pipeline"이 이 파일 자체로 해석됨)
+sys.path.append(str(BASE_DIR))
 
 ENV_PATH = BASE_DIR / ".env"
 load_dotenv(ENV_PATH, override=True)
@@ -31,6 +35,11 @@ from quiz.reflect import generate_reflect_quiz
 # --- Wrapper ---
 from wrapper.course_wrapper import build_course_packages
 
+# --- 퀴즈 생성 DAG / 체크포인트 ---
+from src.pipeline.dag import DagExecutor, Node, critical_path_seconds
+from src.pipeline.checkpoint import CheckpointStore
+from src.pipeline.profiling import RunProfiler
+
 # === 로깅 설정 ===
 logging.basicConfig(
     level=logging.INFO,
@@ -38,60 +47,249 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# === 퀴즈 생성기 의존성 ===
+# short   : SUMMARY_READING 결과 파일을 읽어 생성
+# reflect : 같은 세션의 다른 퀴즈 파일 전체를 읽어 생성
+# 나머지는 서로 독립 → 동시 실행
+# llm=False : LLM을 호출하지 않는 노드 → LLM 동시 실행 예산(PIPELINE_LLM_BUDGET)을 쓰지 않음
+_INDEPENDENT_NODES = [
+    Node("article_reading", generate_article_reading_quiz, llm=False),   # 기사 메타데이터만 저장
+    Node("summary_reading", generate_summary_reading_quiz),
+    Node("term", generate_term_quiz),
+    Node("current_affairs", generate_current_affairs_quiz),
+    Node("ox", generate_ox_quiz),
+    Node("multi", generate_multi_choice_quiz),
+    Node("completion", generate_completion_quiz),
+]
+QUIZ_GENERATION_DAG = _INDEPENDENT_NODES + [
+    Node("short", generate_short_quiz, deps=("summary_reading",)),
+    Node("reflect", generate_reflect_quiz, deps=tuple(n.name for n in _INDEPENDENT_NODES) + ("short",)),
+]
 
-def run_learning_pipeline():
-    logger.info("=== START LEARNING PIPELINE ===")
+# === 단계별 입·출력 위치 (체크포인트 판단용) ===
+DATA_DIR = BASE_DIR / "data"
+BACKUP_DIR = DATA_DIR / "backup"
+COURSE_DIR = DATA_DIR / "course_db"
+FILTER_DIR = COURSE_DIR / "filtered"
+QUIZ_DIR = DATA_DIR / "quiz"
 
-    fetch_news()
-    generate_all_courses()
-    refine_course_structure()
-    logger.info("Course generation step skipped (already exists)")
+# 생성기별 출력 파일 종류: {topic}_{courseId}_{sessionId}_{TYPE}_{level}_{today}.json
+QUIZ_OUTPUT_TYPES = {
+    "article_reading": "ARTICLE_READING",
+    "summary_reading": "SUMMARY_READING",
+    "term": "TERM_LEARNING",
+    "current_affairs": "CURRENT_AFFAIRS",
+    "ox": "OX_QUIZ",
+    "multi": "MULTIPLE_CHOICE",
+    "short": "SHORT_ANSWER",
+    "completion": "SENTENCE_COMPLETION",
+    "reflect": "SESSION_REFLECTION",
+}
 
-    logger.info("=== START QUIZ GENERATION (courseId=1, sessionId=1) ===")
+# --force 에 쓸 수 있는 단계 이름 (퀴즈 생성기는 개별 이름 또는 quiz 전체)
+STAGES = ["fetch_news", "generate_all_courses", "refine_course_structure", "quiz", *QUIZ_OUTPUT_TYPES]
+
+
+def _source(func) -> Path:
+    """단계 함수가 정의된 소스 파일 - 코드가 바뀌면 입력 해시도 바뀜"""
+    return Path(sys.modules[func.__module__].__file__)
+
+
+def _session_key(session: dict) -> str:
+    return f"{session.get('topic')}_{session.get('courseId')}_{session.get('sessionId')}"
 
-    sessions = select_session()
-    logger.info(f"총 세션 수: {len(sessions)}")
 
-    selected_by_topic = {}
+def _quiz_outputs(key: str, node_name: str, today: str) -> list:
+    return sorted(QUIZ_DIR.glob(f"{key}_{QUIZ_OUTPUT_TYPES[node_name]}_*_{today}.json"))
 
+
+def _checkpointed(node: Node, store: CheckpointStore, today: str, profiler: RunProfiler) -> Node:
+    """생성기 노드를 체크포인트로 감쌈. 입력 = 세션 정보 + 생성기 코드 + 의존 노드 출력 파일
+    실제 생성이 일어난 경우만 생성기별 리포트(quiz:{생성기})에 집계"""
+    def run(session):
+        key = _session_key(session)
+
+        def generate():
+            with profiler.stage(f"quiz:{node.name}", kind="generator"):
+                node.func(session)
+
+        store.run(
+            f"quiz:{node.name}:{key}",
+            generate,
+            inputs=lambda: [
+                session,
+                _source(node.func),
+                *[p for dep in node.deps for p in _quiz_outputs(key, dep, today)],
+            ],
+            outputs=lambda: _quiz_outputs(key, node.name, today),
+        )
+    return node._replace(func=run)
+
+
+def select_quiz_sessions(sessions: list) -> dict:
+    """퀴즈 생성 대상 세션 선택 → {"{topic}_{courseId}_{sessionId}": session} (우선순위 순)
+    PIPELINE_QUIZ_SCOPE=first : 토픽별 courseId=1, sessionId=1 세션만 (기본)
+    PIPELINE_QUIZ_SCOPE=all   : 모든 세션, 코스 1 → 세션 번호 순 우선
+    PIPELINE_QUIZ_MAX_SESSIONS: 1회 실행당 최대 세션 수 (0 = 제한 없음)"""
+    scope = os.getenv("PIPELINE_QUIZ_SCOPE", "first")
+    max_sessions = int(os.getenv("PIPELINE_QUIZ_MAX_SESSIONS", "0"))
+    if scope not in ("first", "all"):
+        raise ValueError(f"지원하지 않는 PIPELINE_QUIZ_SCOPE: {scope} (first | all)")
+
+    topic_order = {}
+    selected = {}
     for s in sessions:
-        if s.get("courseId") != 1:
-            continue
-        if s.get("sessionId") != 1:
+        cid, sid, topic = s.get("courseId"), s.get("sessionId"), s.get("topic")
+        if scope == "first" and (cid != 1 or sid != 1):
             continue
+        key = _session_key(s)
+        if key not in selected:
+            topic_order.setdefault(topic, len(topic_order))
+            selected[key] = s
 
-        topic = s.get("topic")
-        if topic not in selected_by_topic:
-            selected_by_topic[topic] = s
-            logger.info(
-                f"선택됨 → topic={topic}, courseId=1, sessionId=1"
-            )
+    def priority(item):
+        s = item[1]
+        return (s.get("courseId") or 0, s.get("sessionId") or 0, topic_order[s.get("topic")])
 
-    logger.info(f"총 퀴즈 생성 대상 세션 수: {len(selected_by_topic)}")
+    ordered = sorted(selected.items(), key=priority)
+    if max_sessions and len(ordered) > max_sessions:
+        logger.warning(f"세션 상한 적용: {len(ordered)}개 중 {max_sessions}개만 생성 (PIPELINE_QUIZ_MAX_SESSIONS)")
+        ordered = ordered[:max_sessions]
 
-    for topic, session in selected_by_topic.items():
-        logger.info(f"퀴즈 생성 시작 → [{topic}] {session.get('headline')}")
+    for key, s in ordered:
+        logger.info(f"선택됨 → {key} {s.get('headline', '')}")
+    return dict(ordered)
 
+
+def run_learning_pipeline(on_progress=None, force=None, incremental=None):
+    """전체 학습 파이프라인 실행. on_progress(stage, info)가 주어지면 단계 경계마다 진행 상황 전달
+    (별도 프로세스 실행 시 API 프로세스로 보고하는 용도) → 결과 요약 dict 반환.
+    입력이 바뀌지 않은 단계는 체크포인트로 건너뜀 - force(없으면 PIPELINE_FORCE)로 지정한 단계는 강제 재실행.
+    incremental(없으면 NEWS_FETCH_INCREMENTAL)이면 뉴스를 워터마크 이후분만 수집해 오늘 백업에 추가.
+    실행마다 단계별 소요 시간·외부 호출 리포트를 data/quiz/package/reports/에 저장 (실패한 실행 포함)"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    profiler = RunProfiler(today)
+    with profiler.activate():
         try:
-            generate_article_reading_quiz(session)
-            generate_summary_reading_quiz(session)
-            generate_term_quiz(session)
-            generate_current_affairs_quiz(session)
-            generate_ox_quiz(session)
-            generate_multi_choice_quiz(session)
-            generate_short_quiz(session)
-            generate_completion_quiz(session)
-            generate_reflect_quiz(session)
+            result = _run_stages(today, profiler, on_progress, force, incremental)
+        finally:
+            try:
+                report_path = profiler.write()
+            except Exception as e:
+                logger.error(f"실행 리포트 저장 실패: {e}", exc_info=True)
+                report_path = None
+    result["report"] = str(report_path.relative_to(BASE_DIR)) if report_path else None
+    return result
+
+
+def _run_stages(today: str, profiler: RunProfiler, on_progress, force, incremental) -> dict:
+    def report(stage: str, **info):
+        if on_progress is not None:
+            on_progress(stage, info)
+
+    logger.info("=== START LEARNING PIPELINE ===")
+
+    store = CheckpointStore.from_env(today, force)
+    if incremental is None:
+        incremental = os.getenv("NEWS_FETCH_INCREMENTAL", "0") == "1"
+    if incremental:
+        # 증분 수집은 실행할 때마다 새 기사를 확인해야 하므로 체크포인트와 무관하게 실행
+        # (새 기사가 없으면 백업이 그대로라 이후 단계는 체크포인트로 건너뜀)
+        store.force.add("fetch_news")
+    if store.force:
+        logger.info(f"강제 재실행 단계: {sorted(store.force)}")
+
+    report("fetch_news", incremental=incremental)
+    with profiler.stage("fetch_news"):
+        store.run(
+            "fetch_news", lambda: fetch_news(incremental=incremental),
+            inputs=lambda: [today, _source(fetch_news)],
+            outputs=lambda: sorted(BACKUP_DIR.glob(f"*_{today}.json")),
+        )
+    report("generate_courses")
+    with profiler.stage("generate_all_courses"):
+        store.run(
+            "generate_all_courses", generate_all_courses,
+            inputs=lambda: [_source(generate_all_courses), *sorted(BACKUP_DIR.glob(f"*_{today}.json"))],
+            outputs=lambda: sorted(COURSE_DIR.glob(f"*_{today}.json")),
+        )
+    report("refine_courses")
+    with profiler.stage("refine_course_structure"):
+        store.run(
+            "refine_course_structure", refine_course_structure,
+            inputs=lambda: [_source(refine_course_structure), *sorted(COURSE_DIR.glob(f"*_{today}.json"))],
+            outputs=lambda: sorted(FILTER_DIR.glob(f"*_{today}.json")),
+        )
 
-            logger.info(f"퀴즈 생성 완료 → [{topic}]")
+    logger.info("=== START QUIZ GENERATION ===")
 
-        except Exception:
-            logger.exception(f"퀴즈 생성 실패 → [{topic}]")
+    report("select_session")
+    with profiler.stage("select_session"):
+        sessions = select_session()
+    logger.info(f"총 세션 수: {len(sessions)}")
+
+    selected_sessions = select_quiz_sessions(sessions)
+    logger.info(f"총 퀴즈 생성 대상 세션 수: {len(selected_sessions)}")
+
+    # === 세션 × 생성기 DAG 동시 실행 (워커 수 / LLM 동시 호출 예산은 환경 변수로 조정) ===
+    executor = DagExecutor.from_env([_checkpointed(n, store, today, profiler) for n in QUIZ_GENERATION_DAG])
+    report("generate_quizzes", total=len(selected_sessions))
+    started = time.perf_counter()
+    with profiler.stage("generate_quizzes"):
+        node_results = executor.run(
+            selected_sessions,
+            on_node_done=lambda r: report("quiz_node", session=r.key, node=r.node, status=r.status,
+                                          seconds=round(r.seconds, 2)),
+        )
+    elapsed = time.perf_counter() - started
+
+    failed_sessions = sorted({r.key for r in node_results if r.status != "ok"})
+    for key in selected_sessions:
+        if key in failed_sessions:
+            logger.warning(f"퀴즈 생성 일부 실패 → [{key}]")
+        else:
+            logger.info(f"퀴즈 생성 완료 → [{key}]")
+
+    critical_paths = critical_path_seconds(QUIZ_GENERATION_DAG, node_results)
+    serial_seconds = sum(r.seconds for r in node_results)
+    logger.info(
+        f"퀴즈 생성 소요: {elapsed:.1f}s (노드 합계 {serial_seconds:.1f}s, "
+        f"최장 임계 경로 {max(critical_paths.values(), default=0.0):.1f}s)"
+    )
 
     logger.info("=== START COURSE PACKAGING ===")
-    build_course_packages()
+    report("build_packages")
+    with profiler.stage("build_packages"):
+        build_course_packages()
     logger.info("=== PIPELINE PROCESS COMPLETED ===")
+    logger.info(f"체크포인트: 실행 {len(store.stats['ran'])}단계 / 건너뜀 {len(store.stats['skipped'])}단계")
+
+    return {
+        "sessions": list(selected_sessions),
+        "failedSessions": failed_sessions,
+        "quizGeneration": {
+            "elapsed": round(elapsed, 1),
+            "criticalPath": critical_paths,
+            "nodes": [r._asdict() for r in node_results],
+        },
+        "checkpoints": store.stats,
+    }
 
 
 if __name__ == "__main__":
-    run_learning_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="NIEdu 학습 파이프라인 (입력이 같은 단계는 체크포인트로 건너뜀)")
+    parser.add_argument(
+        "--force", action="append", default=[], metavar="STAGE",
+        help=f"강제 재실행할 단계 (여러 번 지정 가능, 쉼표 구분 가능): {', '.join(STAGES)}, all",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="뉴스를 오늘 워터마크 이후 기사만 수집해 기존 백업에 추가 (하루 중 재실행용)",
+    )
+    args = parser.parse_args()
+
+    force = [f.strip() for value in args.force for f in value.split(",") if f.strip()]
+    unknown = [f for f in force if f not in STAGES and f != "all"]
+    if unknown:
+        parser.error(f"알 수 없는 단계: {unknown}")
+    run_learning_pipeline(force=force or None, incremental=args.incremental or None)
\ No newline at end of file
@@ -0,0 +1,298 @@
+# === src/pipeline/profiling.py ===
+# 파이프라인 실행 1회에 대한 단계별 소요 시간 / 비용 리포트
+# 단계·생성기마다 wall time, CPU time, 최대 RSS와 외부 호출 수(서비스별)를 모으고
+# 실행이 끝나면 data/quiz/package/reports/pipeline_{today}_{시각}.json 으로 저장
+# 외부 호출은 httpx(OpenAI SDK·langchain-openai·DeepSearch)와 requests(Google CSE)의 send를 감싸서 집계하고,
+# 어느 단계의 호출인지는 contextvars로 구분 (스레드 풀로 넘어갈 때는 DagExecutor가 컨텍스트를 복사)
+import os, sys, json, time, logging, threading, contextvars
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+try:
+    import resource
+except ImportError:  # Windows 등 - RSS 기록 생략
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+REPORT_DIR = BASE_DIR / "data" / "quiz" / "package" / "reports"
+
+# 현재 실행 중인 프로파일러 / 단계 (외부 호출 귀속용)
+# 전역 변수 대신 컨텍스트 변수 → thread 모드로 API 프로세스 안에서 돌아도 API 요청의 호출은 섞이지 않음
+_active_profiler: contextvars.ContextVar = contextvars.ContextVar("pipeline_profiler", default=None)
+_current_stage: contextvars.ContextVar = contextvars.ContextVar("pipeline_stage", default=None)
+_hooks_installed = False
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """프로세스 최대 RSS (MB) - Linux는 KB, macOS는 byte 단위"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def classify_service(url: str, body: Optional[bytes]) -> str:
+    """요청 URL(+본문)으로 서비스 구분: openai:{model} / deepsearch / google_cse / other:{host}"""
+    parts = urlsplit(str(url))
+    host = parts.hostname or ""
+    if host == "api.openai.com":
+        model = None
+        if body:
+            try:
+                model = json.loads(body).get("model")
+            except (ValueError, AttributeError):
+                pass
+        return f"openai:{model or 'unknown'}"
+    if host.endswith("deepsearch.com"):
+        return "deepsearch"
+    if host == "www.googleapis.com" and parts.path.startswith("/customsearch"):
+        return "google_cse"
+    return f"other:{host}"
+
+
+def _new_call_stats() -> dict:
+    return {"calls": 0, "errors": 0, "seconds": 0.0, "promptTokens": 0, "completionTokens": 0}
+
+
+class StageStats:
+    """같은 이름으로 여러 번 실행되는 단계(예: 세션마다 실행되는 생성기)는 누적"""
+
+    def __init__(self, name: str, kind: str, parent: Optional["StageStats"]):
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.runs = 0
+        self.failures = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_rss_mb = None
+        self.rss_growth_mb = 0.0
+        self.calls = {}
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "parent": self.parent.name if self.parent else None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "wallSeconds": round(self.wall, 2),
+            "cpuSeconds": round(self.cpu, 2),
+            "peakRssMb": self.peak_rss_mb,
+            "rssGrowthMb": round(self.rss_growth_mb, 1),
+            "calls": {k: {**v, "seconds": round(v["seconds"], 2)} for k, v in sorted(self.calls.items())},
+        }
+
+
+class RunProfiler:
+    def __init__(self, today: str):
+        self.today = today
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.calls = {}
+
+    @contextmanager
+    def activate(self):
+        """이 컨텍스트(와 여기서 파생된 스레드·태스크)의 외부 호출 집계를 이 프로파일러로 보냄"""
+        install_http_hooks()
+        token = _active_profiler.set(self)
+        try:
+            yield self
+        finally:
+            _active_profiler.reset(token)
+
+    @contextmanager
+    def stage(self, name: str, kind: str = "stage"):
+        """단계 측정. kind=generator는 스레드 풀에서 동시에 도는 생성기 → 해당 스레드 CPU 시간만 측정"""
+        parent = _current_stage.get()
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats(name, kind, parent)
+        cpu_clock = time.thread_time if kind == "generator" else time.process_time
+        rss_before = _peak_rss_mb()
+        token = _current_stage.set(stats)
+        start, start_cpu = time.perf_counter(), cpu_clock()
+        failed = False
+        try:
+            yield stats
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            wall, cpu = time.perf_counter() - start, cpu_clock() - start_cpu
+            _current_stage.reset(token)
+            rss_after = _peak_rss_mb()
+            with self._lock:
+                stats.runs += 1
+                stats.failures += failed
+                stats.wall += wall
+                stats.cpu += cpu
+                if rss_after is not None:
+                    stats.peak_rss_mb = max(stats.peak_rss_mb or 0.0, rss_after)
+                    stats.rss_growth_mb += rss_after - (rss_before or rss_after)
+
+    def record_call(self, service: str, seconds: float, error: bool, usage: Optional[dict]):
+        """외부 호출 1건을 실행 전체 + 현재 단계와 상위 단계에 누적"""
+        stage = _current_stage.get()
+        with self._lock:
+            targets = [self.calls]
+            while stage is not None:
+                targets.append(stage.calls)
+                stage = stage.parent
+            for calls in targets:
+                entry = calls.setdefault(service, _new_call_stats())
+                entry["calls"] += 1
+                entry["errors"] += error
+                entry["seconds"] += seconds
+                if usage:
+                    entry["promptTokens"] += usage.get("prompt_tokens") or 0
+                    entry["completionTokens"] += usage.get("completion_tokens") or 0
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                "date": self.today,
+                "startedAt": self.started_at,
+                "wallSeconds": round(time.perf_counter() - self._start, 2),
+                "cpuSeconds": round(time.process_time() - self._start_cpu, 2),
+                "peakRssMb": _peak_rss_mb(),
+                "pid": os.getpid(),
+                "calls": {k: {**v, "seconds": round(v["seconds"], 2)} for k, v in sorted(self.calls.items())},
+                "stages": [s.as_dict() for s in self.stages.values()],
+            }
+
+    def summary_line(self, report: dict = None) -> str:
+        report = report or self.report()
+        stages = ", ".join(
+            f"{s['name']} {s['wallSeconds']:.1f}s" for s in report["stages"] if s["kind"] == "stage"
+        )
+        calls = ", ".join(f"{k} {v['calls']}회" for k, v in report["calls"].items()) or "없음"
+        tokens = sum(v["promptTokens"] + v["completionTokens"] for v in report["calls"].values())
+        return (f"파이프라인 {report['wallSeconds']:.1f}s (CPU {report['cpuSeconds']:.1f}s, "
+                f"최대 RSS {report['peakRssMb']}MB) | 단계: {stages} | 외부 호출: {calls} | 토큰 {tokens:,}")
+
+    def write(self, directory: Path = REPORT_DIR) -> Path:
+        """리포트 저장 (파일명에 날짜 포함 → clean.py 정리 규칙 그대로 적용)"""
+        report = self.report()
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%H%M%S", time.localtime(self.started_at))
+        path = directory / f"pipeline_{self.today}_{stamp}.json"
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        logger.info(self.summary_line(report))
+        return path
+
+
+# === HTTP 클라이언트 훅 ===
+def _response_usage(service: str, payload) -> Optional[dict]:
+    if not service.startswith("openai:") or not isinstance(payload, dict):
+        return None
+    return payload.get("usage")
+
+
+def _record(service: str, seconds: float, error: bool, payload=None):
+    profiler = _active_profiler.get()
+    if profiler is not None:
+        profiler.record_call(service, seconds, error, _response_usage(service, payload))
+
+
+def _httpx_payload(service: str, response):
+    """OpenAI 응답 중 본문을 이미 읽은 것만 파싱 (스트리밍 응답은 토큰 집계 생략)"""
+    import httpx
+    if not service.startswith("openai:"):
+        return None
+    try:
+        return response.json()
+    except (httpx.ResponseNotRead, ValueError):
+        return None
+
+
+def _httpx_request_body(request) -> Optional[bytes]:
+    import httpx
+    try:
+        return request.content
+    except httpx.RequestNotRead:
+        return None
+
+
+def install_http_hooks():
+    """httpx.Client / httpx.AsyncClient / requests.Session 의 send를 감쌈 (한 번만, 미설치 라이브러리는 건너뜀)"""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    _hooks_installed = True
+
+    try:
+        import httpx
+    except ImportError:
+        httpx = None
+    if httpx is not None:
+        sync_send, async_send = httpx.Client.send, httpx.AsyncClient.send
+
+        def send(self, request, *args, **kwargs):
+            if _active_profiler.get() is None:
+                return sync_send(self, request, *args, **kwargs)
+            service = classify_service(request.url, _httpx_request_body(request))
+            start = time.perf_counter()
+            try:
+                response = sync_send(self, request, *args, **kwargs)
+            except Exception:
+                _record(service, time.perf_counter() - start, True)
+                raise
+            _record(service, time.perf_counter() - start, response.is_error, _httpx_payload(service, response))
+            return response
+
+        async def asend(self, request, *args, **kwargs):
+            if _active_profiler.get() is None:
+                return await async_send(self, request, *args, **kwargs)
+            service = classify_service(request.url, _httpx_request_body(request))
+            start = time.perf_counter()
+            try:
+                response = await async_send(self, request, *args, **kwargs)
+            except Exception:
+                _record(service, time.perf_counter() - start, True)
+                raise
+            _record(service, time.perf_counter() - start, response.is_error, _httpx_payload(service, response))
+            return response
+
+        httpx.Client.send = send
+        httpx.AsyncClient.send = asend
+
+    try:
+        import requests
+    except ImportError:
+        requests = None
+    if requests is not None:
+        requests_send = requests.Session.send
+
+        def session_send(self, request, **kwargs):
+            if _active_profiler.get() is None:
+                return requests_send(self, request, **kwargs)
+            body = request.body.encode("utf-8") if isinstance(request.body, str) else request.body
+            service = classify_service(request.url, body)
+            start = time.perf_counter()
+            try:
+                response = requests_send(self, request, **kwargs)
+            except Exception:
+                _record(service, time.perf_counter() - start, True)
+                raise
+            payload = None
+            if service.startswith("openai:") and not kwargs.get("stream"):
+                try:
+                    payload = response.json()
+                except ValueError:
+                    pass
+            _record(service, time.perf_counter() - start, not response.ok, payload)
+            return response
+
+        requests.Session.send = session_send
@@ -0,0 +1,47 @@
+# === src/pipeline/worker.py ===
+# 파이프라인 전용 워커 프로세스 진입점: python -m src.pipeline.worker
+# 진행 상황·결과를 stdout에 JSON Lines로 보고 (API 프로세스가 읽어 상태로 노출)
+# 파이프라인 내부 print/로그는 stderr로 돌려 보고 채널과 섞이지 않도록 함
+import os, sys, json, time, traceback
+
+
+def _open_event_channel():
+    """원래 stdout(fd 1)을 보고 채널로 복제하고, fd 1은 stderr로 돌림 (C 확장 출력 포함)"""
+    channel = os.fdopen(os.dup(1), "w", encoding="utf-8", buffering=1)
+    sys.stdout.flush()
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    return channel
+
+
+def main() -> int:
+    channel = _open_event_channel()
+    started = time.time()
+
+    def emit(event: str, **data):
+        channel.write(json.dumps({"event": event, "ts": time.time(), **data}, ensure_ascii=False) + "\n")
+
+    # 서빙 프로세스보다 낮은 CPU 우선순위로 실행
+    nice = int(os.getenv("PIPELINE_NICE", "10"))
+    if nice and hasattr(os, "nice"):
+        try:
+            os.nice(nice)
+        except OSError:
+            pass
+
+    emit("started", pid=os.getpid())
+    try:
+        from src.pipeline.pipeline import run_learning_pipeline
+        result = run_learning_pipeline(on_progress=lambda stage, info: emit("progress", stage=stage, **info))
+    except BaseException as exc:
+        traceback.print_exc()
+        emit("failed", error=f"{type(exc).__name__}: {exc}", traceback=traceback.format_exc(),
+             elapsed=round(time.time() - started, 1))
+        return 1
+
+    emit("completed", result=result, elapsed=round(time.time() - started, 1))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,84 @@ import os
 import json
 import asyncio
 import logging
-from typing import Tuple
+from collections import defaultdict
+from typing import AsyncContextManager, AsyncIterator, Callable, Optional, Tuple
+import httpx
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
 from pydantic import BaseModel
+from src.quiz.feedback_cache import FeedbackCache
+from src.quiz.fast_scorer import FastScorer
+from src.quiz.dimension_guard import DimensionGuard, DimensionTimeout
 
 logger = logging.getLogger(__name__)
 
+# 통신 오류 / 시간 초과로 차원이 빠졌을 때 피드백 문구
+API_ERROR_FEEDBACK = "평가 시스템 통신 오류가 발생했습니다."
+TIMEOUT_FEEDBACK = "평가 응답이 지연되어 이 항목은 점수에서 제외했습니다."
+
+EVAL_MODES = ("split", "combined")
+
+# === 차원별 가중치 (의미 60%, 맥락 30%, 문법 10%) ===
+DIMENSION_WEIGHTS = {"meaning": 0.6, "context": 0.3, "grammar": 0.1}
+
+# === combined 모드 구조화 출력 스키마 ===
+_DIMENSION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "integer"},
+        "feedback": {"type": "string"},
+    },
+    "required": ["score", "feedback"],
+    "additionalProperties": False,
+}
+COMBINED_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "feedback_scores",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {name: _DIMENSION_SCHEMA for name in DIMENSION_WEIGHTS},
+            "required": list(DIMENSION_WEIGHTS),
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+class EvaluationUnavailable(Exception):
+    """모든 차원이 시간 초과·오류로 빠져 점수를 낼 수 없음 → 0점 대신 실패로 응답 (캐시하지 않음)"""
+
+
+def weighted_total(m_score: Optional[int], c_score: Optional[int], g_score: Optional[int]) -> int:
+    """가중치 합산 후 십 단위 반올림. 시간 초과·오류로 빠진 차원(None)은 제외하고 남은 가중치로 재정규화.
+    모든 차원이 빠지면 EvaluationUnavailable"""
+    scores = {"meaning": m_score, "context": c_score, "grammar": g_score}
+    returned = {name: score for name, score in scores.items() if score is not None}
+    if not returned:
+        raise EvaluationUnavailable("모든 평가 차원이 시간 초과 또는 오류로 응답하지 않았습니다.")
+    weighted = sum(DIMENSION_WEIGHTS[name] * score for name, score in returned.items())
+    if len(returned) < len(scores):
+        weighted /= sum(DIMENSION_WEIGHTS[name] for name in returned)
+    total = int(weighted)
+    return int(round(total / 10) * 10)
+
+
+def create_openai_client() -> AsyncOpenAI:
+    """keep-alive 커넥션 풀을 공유하는 AsyncOpenAI 클라이언트 (프로세스당 1개 생성해 재사용)"""
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "50")),
+        max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "120")),
+    )
+    timeout = httpx.Timeout(
+        float(os.getenv("OPENAI_TIMEOUT", "60")),
+        connect=float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5")),
+    )
+    http_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
+
 class QuizRequest(BaseModel):
     contentId: int
     referenceAnswer: str  
@@ -19,31 +90,99 @@ class QuizResponse(BaseModel):
     AIScore: int          # 필드명 변경: score -> AIScore
     AIFeedback: str       # 필드명 변경: comment -> AIFeedback
 
+class QuizBatchResult(BaseModel):
+    contentId: int
+    result: Optional[QuizResponse] = None   # 성공 시 평가 결과
+    error: Optional[str] = None             # 실패 시 항목별 오류 메시지
+
 class KoreanQuizEvaluator:
-    def __init__(self):
+    def __init__(self, client: AsyncOpenAI = None, cache: FeedbackCache = None,
+                 mode: str = None, use_cache: bool = True, fast_scorer: FastScorer = None,
+                 use_fast_path: bool = True):
         load_dotenv(override=True)
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = client or create_openai_client()
         self.model_main = "gpt-4o"
         self.model_grammar = "gpt-4o-mini"
 
-    async def _call_gpt_api(self, model: str, prompt: str) -> Tuple[int, str]:
-        """OpenAI API 호출 공통 메서드"""
+        # split: 차원별 3회 호출 (기본) / combined: 구조화 출력 1회 호출
+        self.mode = mode or os.getenv("FEEDBACK_EVAL_MODE", "split")
+        if self.mode not in EVAL_MODES:
+            raise ValueError(f"지원하지 않는 평가 방식: {self.mode} (split | combined)")
+
+        self.cache = (cache if cache is not None else FeedbackCache.from_env()) if use_cache else None
+
+        # 명백한 답안(빈 답안·무의미 입력·모범답안과 거의 동일·무관)은 LLM 호출 없이 로컬에서 확정
+        self.fast_scorer = (fast_scorer or FastScorer.from_env()) if use_fast_path else None
+
+        # 차원별 마감 시간 + p95 초과 시 중복 요청
+        self.guard = DimensionGuard.from_env()
+
+        # 모델별 호출 수 / 토큰 사용량 (벤치마크·모니터링용)
+        self.usage = defaultdict(lambda: {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+
+    @property
+    def cache_namespace(self) -> str:
+        """모델 구성·평가 방식이 바뀌면 이전 캐시를 쓰지 않도록 키에 포함"""
+        namespace = f"v1/{self.mode}/{self.model_main}/{self.model_grammar}"
+        if self.fast_scorer is not None:
+            namespace += f"/{self.fast_scorer.signature}"
+        return namespace
+
+    async def warmup(self, connections: int = 3, timeout: float = None):
+        """TLS 핸드셰이크를 미리 끝내 첫 요청부터 keep-alive 커넥션을 재사용 (요청당 3개 병렬 호출 기준).
+        OpenAI가 느리거나 닿지 않아도 오래 붙잡히지 않도록 짧은 timeout(OPENAI_WARMUP_TIMEOUT) + 재시도 없음.
+        with_options 사본도 같은 커넥션 풀을 쓰므로 예열 효과는 그대로"""
+        if timeout is None:
+            timeout = float(os.getenv("OPENAI_WARMUP_TIMEOUT", "3"))
+        client = self.client.with_options(timeout=timeout, max_retries=0)
+        results = await asyncio.gather(
+            *[client.models.retrieve(self.model_grammar) for _ in range(connections)],
+            return_exceptions=True,
+        )
+        failed = [r for r in results if isinstance(r, Exception)]
+        if failed:
+            logger.warning("OpenAI 커넥션 예열 일부 실패 (%d/%d): %s", len(failed), connections, failed[0])
+        else:
+            logger.info("OpenAI 커넥션 예열 완료 (%d개)", connections)
+
+    async def aclose(self):
+        """공유 커넥션 풀 + 캐시 DB 정리 (남은 캐시 쓰기 대기는 스레드에서)"""
+        await self.client.close()
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.close)
+
+    async def _request_json(self, model: str, prompt: str, response_format: dict = None) -> dict:
+        """OpenAI JSON 응답 요청 (사용량 집계 포함). 실패 시 예외 전파"""
+        res = await self.client.chat.completions.create(
+            model=model,
+            temperature=0.0,
+            messages=[{"role": "user", "content": prompt}],
+            response_format=response_format or {"type": "json_object"},
+        )
+        usage = self.usage[model]
+        usage["calls"] += 1
+        if res.usage is not None:
+            usage["prompt_tokens"] += res.usage.prompt_tokens
+            usage["completion_tokens"] += res.usage.completion_tokens
+
+        raw_content = res.choices[0].message.content
+        logger.info("GPT raw response: %s", raw_content)
+        return json.loads(raw_content)
+
+    async def _call_gpt_api(self, model: str, prompt: str, dimension: str) -> Tuple[Optional[int], str]:
+        """OpenAI API 호출 공통 메서드 - 차원별 마감 시간 적용.
+        시간 초과·통신 오류는 0점이 아니라 점수 None(합산에서 제외)으로 반환"""
         try:
-            res = await self.client.chat.completions.create(
-                model=model,
-                temperature=0.0,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
-            )
-            raw_content = res.choices[0].message.content
-            logger.info("GPT raw response: %s", raw_content)
-            data = json.loads(raw_content)
+            data = await self.guard.run(dimension, lambda: self._request_json(model, prompt))
             return data.get("score", 0), data.get("feedback", "평가 중 오류가 발생했습니다.")
+        except DimensionTimeout as e:
+            logger.warning("API 호출 시간 초과: %s", e)
+            return None, TIMEOUT_FEEDBACK
         except Exception as e:
-            print(f"API 호출 중 오류 발생: {e}")
-            return 0, "평가 시스템 통신 오류가 발생했습니다."
+            logger.warning("API 호출 중 오류 발생 (%s): %s", dimension, e)
+            return None, API_ERROR_FEEDBACK
 
-    async def evaluate_meaning(self, answer: str, userAnswer: str) -> Tuple[int, str]:
+    async def evaluate_meaning(self, answer: str, userAnswer: str) -> Tuple[Optional[int], str]:
         """의미 평가 (60%) - 프롬프트 유지"""
         prompt = f"""
     당신은 뉴스 문장 평가 전문가이자 한국어 학습 피드백 코치입니다.
@@ -78,9 +217,9 @@ class KoreanQuizEvaluator:
     "feedback": "100자 이내 피드백"
     }}
     """
-        return await self._call_gpt_api(self.model_main, prompt)
+        return await self._call_gpt_api(self.model_main, prompt, "meaning")
 
-    async def evaluate_context(self, answer: str, userAnswer: str) -> Tuple[int, str]:
+    async def evaluate_context(self, answer: str, userAnswer: str) -> Tuple[Optional[int], str]:
         """맥락 평가 (30%) - 프롬프트 유지"""
         prompt = f"""
     당신은 뉴스 문맥 흐름 평가 전문가입니다.
@@ -126,9 +265,9 @@ class KoreanQuizEvaluator:
     "feedback": "100자 이내 피드백"
     }}
     """
-        return await self._call_gpt_api(self.model_main, prompt)
+        return await self._call_gpt_api(self.model_main, prompt, "context")
 
-    async def evaluate_grammar(self, userAnswer: str) -> Tuple[int, str]:
+    async def evaluate_grammar(self, userAnswer: str) -> Tuple[Optional[int], str]:
         """문법 평가 (10%) - 프롬프트 유지"""
         prompt = f"""
     너는 한국어 문장의 문법적 완성도를 평가하는 전문가야.
@@ -154,28 +293,175 @@ class KoreanQuizEvaluator:
     [문장]
     {userAnswer}
     """
-        return await self._call_gpt_api(self.model_grammar, prompt)
+        return await self._call_gpt_api(self.model_grammar, prompt, "grammar")
 
-    async def solve_feedback_quiz(self, request: QuizRequest) -> QuizResponse:
-        """최종 평가 실행 및 가중치 합산"""
-        
-        results = await asyncio.gather(
-            self.evaluate_meaning(request.referenceAnswer, request.userAnswer),
-            self.evaluate_context(request.referenceAnswer, request.userAnswer),
-            self.evaluate_grammar(request.userAnswer)
-        )
+    async def evaluate_combined(self, answer: str, userAnswer: str) -> Tuple[Tuple[Optional[int], str], ...]:
+        """의미·맥락·문법을 구조화 출력 1회 호출로 평가 (combined 모드)"""
+        prompt = f"""
+    당신은 뉴스 문장 평가 전문가이자 한국어 학습 피드백 코치입니다.
+    학습자의 문장을 아래 세 가지 기준으로 각각 독립적으로 평가하세요.
 
-        (m_score, m_fb), (c_score, c_fb), (g_score, g_fb) = results
+    [meaning - 의미 평가]
+    학습자의 문장이 모범답안의 핵심 의미(주장, 결론, 방향성)를 얼마나 잘 전달했는지만 평가합니다.
+    문체, 어법, 세부 표현의 차이는 감점하지 않습니다.
+    - 의미가 동일하거나 거의 동일 (핵심 주장 또는 방향성 일치): 90~100점
+    - 핵심 방향은 같으나 표현이 간략하거나 일부 누락된 경우: 80~89점
+    - 주제는 같으나 논리 방향이 약간 어긋남: 60~79점
+    - 핵심 의미가 다르거나 반대 의미로 표현됨: 0~59점
 
-        # 가중치 적용 (의미 60%, 맥락 30%, 문법 10%)
-        total = int(0.6 * m_score + 0.3 * c_score + 0.1 * g_score)
-        
-        # 십 단위 반올림
-        total = int(round(total / 10) * 10)
+    [context - 맥락 평가]
+    모범답안이 형성하는 맥락(인과·설명·추론·전환)을 학습자의 문장이 얼마나 자연스럽게 이어가는지 평가합니다.
+    문법적으로 맞더라도 논리나 흐름이 어색하면 감점하고, 핵심 키워드(정답의 주요 명사·개념어) 누락도 반영합니다.
+    - 전후 문맥과 흐름이 완벽히 일치하고 핵심 키워드 포함: 90~100점
+    - 대체로 자연스럽지만 세부 논리 생략 또는 일부 키워드를 유사어로 대체: 80~89점
+    - 주제는 같지만 논리 전개가 어색하거나 핵심 키워드 대부분 누락: 60~79점
+    - 의미상 기사 흐름에 맞지 않음: 40~59점
+    - 인과나 논리가 반대·역행하거나 완전히 단절됨: 0~39점
+
+    [grammar - 문법 평가]
+    학습자 문장 자체의 문법적 정확성과 어법의 자연스러움만 평가합니다.
+    - 조사, 어미, 어순 오류가 많으면 낮은 점수
+    - 명확하고 자연스러운 문장은 높은 점수
+
+    [멘트 - 각 기준별 feedback]
+    1. 잘한 점과 개선할 점 순서대로 100자 이내로 피드백 해주세요.
+    2. 잘한 점은~ 개선할 점은~ 식의 말을 사용하지 마세요.
+    3. 본론부터 이야기하세요.
+    4. 부드러운 문체의 존댓말 사용
+
+    모범답안: "{answer}"
+    학습자 문장: "{userAnswer}"
+
+    출력(JSON): meaning, context, grammar 각각 {{"score": 0~100 정수, "feedback": "100자 이내 피드백"}}
+    """
+        try:
+            data = await self.guard.run(
+                "combined", lambda: self._request_json(self.model_main, prompt, COMBINED_RESPONSE_FORMAT)
+            )
+            return tuple(
+                (data[name]["score"], data[name]["feedback"])
+                for name in ("meaning", "context", "grammar")
+            )
+        except DimensionTimeout as e:
+            logger.warning("combined 평가 시간 초과: %s", e)
+            return tuple((None, TIMEOUT_FEEDBACK) for _ in range(3))
+        except Exception as e:
+            logger.warning("combined 평가 호출 중 오류 발생: %s", e)
+            return tuple((None, API_ERROR_FEEDBACK) for _ in range(3))
+
+    async def iter_dimensions(self, referenceAnswer: str, userAnswer: str) -> AsyncIterator[Tuple[str, Optional[int], str]]:
+        """차원별 평가 결과를 완료되는 순서대로 (차원, 점수, 피드백) 반환.
+        split 모드는 3개 호출을 동시에 시작해 먼저 끝난 것부터(보통 gpt-4o-mini 문법 평가) 전달"""
+        fast = await self.fast_scorer.score(referenceAnswer, userAnswer) if self.fast_scorer else None
+        if fast is not None:
+            for name, score, feedback in zip(DIMENSION_WEIGHTS, fast.scores, fast.feedbacks):
+                yield name, score, feedback
+            return
+
+        if self.mode == "combined":
+            results = await self.evaluate_combined(referenceAnswer, userAnswer)
+            for name, (score, feedback) in zip(DIMENSION_WEIGHTS, results):
+                yield name, score, feedback
+            return
+
+        async def labeled(name: str, coro):
+            score, feedback = await coro
+            return name, score, feedback
+
+        tasks = [
+            asyncio.ensure_future(labeled("meaning", self.evaluate_meaning(referenceAnswer, userAnswer))),
+            asyncio.ensure_future(labeled("context", self.evaluate_context(referenceAnswer, userAnswer))),
+            asyncio.ensure_future(labeled("grammar", self.evaluate_grammar(userAnswer))),
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # 스트리밍 도중 클라이언트가 끊기면 남은 호출 취소
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _finalize(dimensions: dict) -> Tuple[int, str, bool]:
+        """{차원: (점수, 피드백)} → (가중 합산 점수, 통합 피드백, 캐시 가능 여부).
+        모든 차원이 빠졌으면 EvaluationUnavailable (/feedback 5xx, 스트림 error 이벤트)"""
+        (m_score, m_fb), (c_score, c_fb), (g_score, g_fb) = (
+            dimensions["meaning"], dimensions["context"], dimensions["grammar"]
+        )
+
+        # 가중치 적용 (의미 60%, 맥락 30%, 문법 10%) + 십 단위 반올림 - 빠진 차원은 재정규화
+        total = weighted_total(m_score, c_score, g_score)
 
         # 피드백 통합
         combined_feedback = f"의미: {m_fb}\n맥락: {c_fb}\n문법: {g_fb}"
 
+        # 일부 차원이 빠진 결과는 캐시하지 않음 (다음 요청에서 온전히 재평가)
+        cacheable = None not in (m_score, c_score, g_score)
+        return total, combined_feedback, cacheable
+
+    async def _evaluate(self, referenceAnswer: str, userAnswer: str) -> Tuple[int, str, bool]:
+        """3개 차원 평가 후 가중치 합산 → (점수, 피드백, 캐시 가능 여부)"""
+        dimensions = {}
+        async for name, score, feedback in self.iter_dimensions(referenceAnswer, userAnswer):
+            dimensions[name] = (score, feedback)
+        return self._finalize(dimensions)
+
+    async def cached_response(self, request: QuizRequest) -> Optional[QuizResponse]:
+        """캐시에 저장된 평가 결과 (없거나 캐시를 쓰지 않으면 None) - 수용 제어 슬롯을 잡기 전 확인용"""
+        if self.cache is None:
+            return None
+        key = FeedbackCache.make_key(self.cache_namespace, request.referenceAnswer, request.userAnswer)
+        hit = await self.cache.get(key)
+        if hit is None:
+            return None
+        self.cache.stats["hits"] += 1
+        return QuizResponse(contentId=request.contentId, AIScore=hit[0], AIFeedback=hit[1])
+
+    async def stream_feedback_quiz(self, request: QuizRequest) -> AsyncIterator[Tuple[str, dict]]:
+        """SSE용 평가 - 차원별 결과를 ("dimension", {...})로 먼저 보내고 마지막에 ("result", QuizResponse)
+        캐시 히트면 최종 결과만 즉시 전달"""
+        key = None
+        if self.cache is not None:
+            key = FeedbackCache.make_key(self.cache_namespace, request.referenceAnswer, request.userAnswer)
+            hit = await self.cache.get(key)
+            if hit is not None:
+                self.cache.stats["hits"] += 1
+                yield "result", QuizResponse(contentId=request.contentId, AIScore=hit[0], AIFeedback=hit[1]).model_dump()
+                return
+            self.cache.stats["misses"] += 1
+
+        dimensions = {}
+        async for name, score, feedback in self.iter_dimensions(request.referenceAnswer, request.userAnswer):
+            dimensions[name] = (score, feedback)
+            yield "dimension", {
+                "contentId": request.contentId,
+                "dimension": name,
+                "weight": DIMENSION_WEIGHTS[name],
+                "score": score,
+                "feedback": feedback,
+            }
+
+        total, combined_feedback, cacheable = self._finalize(dimensions)
+        if key is not None and cacheable:
+            self.cache.set(key, total, combined_feedback)
+        yield "result", QuizResponse(contentId=request.contentId, AIScore=total, AIFeedback=combined_feedback).model_dump()
+
+    async def solve_feedback_quiz(self, request: QuizRequest,
+                                  limiter: Callable[[], AsyncContextManager] = None) -> QuizResponse:
+        """최종 평가 실행 및 가중치 합산 (동일 답안은 캐시 / 진행 중인 평가 공유).
+        limiter: 실제 평가(캐시 미스)에만 거는 동시 실행 제한 (수용 제어 슬롯 등) - 캐시 히트·진행 중 평가 공유는 슬롯 없이 응답"""
+        async def evaluate():
+            if limiter is None:
+                return await self._evaluate(request.referenceAnswer, request.userAnswer)
+            async with limiter():
+                return await self._evaluate(request.referenceAnswer, request.userAnswer)
+
+        if self.cache is None:
+            total, combined_feedback, _ = await evaluate()
+        else:
+            key = FeedbackCache.make_key(self.cache_namespace, request.referenceAnswer, request.userAnswer)
+            total, combined_feedback = await self.cache.get_or_compute(key, evaluate)
+
         return QuizResponse(
             contentId=request.contentId,
             AIScore=total,
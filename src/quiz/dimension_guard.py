@@ -0,0 +1,110 @@
+# === src/quiz/dimension_guard.py ===
+# 피드백 차원별(meaning/context/grammar) 호출 마감 시간 + 지연 꼬리(p95 초과) 시 중복 요청(hedge)
+import os, time, asyncio, logging
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 차원별 기본 마감 시간(초) - gpt-4o-mini 문법 평가는 더 짧게
+DEFAULT_TIMEOUTS = {"meaning": 20.0, "context": 20.0, "grammar": 10.0, "combined": 30.0}
+
+
+class DimensionTimeout(Exception):
+    """차원 평가가 마감 시간 안에 끝나지 않음"""
+
+
+class DimensionGuard:
+    """차원별 최근 성공 지연을 기록해 p95를 넘긴 호출에 1회 중복 요청을 보내고, 먼저 끝난 응답을 사용"""
+
+    def __init__(self, timeouts: dict = None, hedge_enabled: bool = False,
+                 hedge_min_samples: int = 20, window: int = 200):
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies = {name: deque(maxlen=window) for name in self.timeouts}
+        self.stats = {
+            name: {"calls": 0, "timeouts": 0, "errors": 0, "hedged": 0, "hedgeWins": 0}
+            for name in self.timeouts
+        }
+
+    @classmethod
+    def from_env(cls) -> "DimensionGuard":
+        """FEEDBACK_TIMEOUT_MEANING / _CONTEXT / _GRAMMAR / _COMBINED (초), FEEDBACK_HEDGE_ENABLED=1 로 hedge 사용"""
+        timeouts = {
+            name: float(os.getenv(f"FEEDBACK_TIMEOUT_{name.upper()}", str(default)))
+            for name, default in DEFAULT_TIMEOUTS.items()
+        }
+        return cls(
+            timeouts=timeouts,
+            hedge_enabled=os.getenv("FEEDBACK_HEDGE_ENABLED", "0") == "1",
+            hedge_min_samples=int(os.getenv("FEEDBACK_HEDGE_MIN_SAMPLES", "20")),
+        )
+
+    def p95(self, dimension: str) -> Optional[float]:
+        samples = self._latencies[dimension]
+        if len(samples) < self.hedge_min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def snapshot(self) -> dict:
+        return {
+            name: {
+                **stats,
+                "timeout": self.timeouts[name],
+                "p95": round(self.p95(name), 3) if self.p95(name) is not None else None,
+            }
+            for name, stats in self.stats.items()
+        }
+
+    async def run(self, dimension: str, call: Callable[[], Awaitable]):
+        """call()을 마감 시간 안에 실행. 관측 p95가 지나도 끝나지 않으면 같은 요청을 1회 더 보내 먼저 성공한 결과 반환.
+        마감 초과 시 DimensionTimeout, 모든 시도가 실패하면 마지막 예외 전파"""
+        stats = self.stats[dimension]
+        stats["calls"] += 1
+        start = time.monotonic()
+        deadline = start + self.timeouts[dimension]
+        hedge_at = None
+        if self.hedge_enabled:
+            p95 = self.p95(dimension)
+            if p95 is not None and start + p95 < deadline:
+                hedge_at = start + p95
+
+        primary = asyncio.ensure_future(call())
+        pending = {primary}
+        last_exc = None
+        try:
+            while pending:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                wake = min(deadline, hedge_at) if hedge_at is not None else deadline
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, wake - now), return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    if task.exception() is None:
+                        self._latencies[dimension].append(time.monotonic() - start)
+                        if task is not primary:
+                            stats["hedgeWins"] += 1
+                        return task.result()
+                    last_exc = task.exception()
+
+                if hedge_at is not None and time.monotonic() >= hedge_at:
+                    # 원 요청이 아직 진행 중일 때만 중복 요청 (이미 실패했다면 재시도하지 않음)
+                    if primary in pending:
+                        stats["hedged"] += 1
+                        logger.info("[%s] p95(%.2fs) 초과 → 중복 요청", dimension, hedge_at - start)
+                        pending.add(asyncio.ensure_future(call()))
+                    hedge_at = None
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if pending or last_exc is None:
+            stats["timeouts"] += 1
+            raise DimensionTimeout(f"{dimension} 평가 {self.timeouts[dimension]:g}초 초과")
+        stats["errors"] += 1
+        raise last_exc
@@ -0,0 +1,32 @@
+# === src/quiz/embedding.py ===
+# 파이프라인 공용 문장 임베딩 모델 (ko-sroberta)
+# 생성기 DAG가 여러 세션을 동시에 돌리므로 호출마다 모델을 만들면 워커 수만큼 복사본이 메모리에 올라감
+# → 프로세스당 1회만 로드해 코스 생성·퀴즈 생성기가 공유 (추론(encode)은 스레드에서 동시 호출 가능)
+import sys, threading, logging
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "jhgan/ko-sroberta-multitask"
+
+# 파이프라인 모듈은 quiz.embedding, 서빙(로컬 선별 채점)은 src.quiz.embedding 으로 import해
+# 같은 파일이 두 모듈로 로드될 수 있음 → 먼저 로드된 쪽의 모델 캐시를 공유 (in-process 파이프라인 실행 시에도 1벌)
+_twin = sys.modules.get({"quiz.embedding": "src.quiz.embedding", "src.quiz.embedding": "quiz.embedding"}.get(__name__, ""))
+if _twin is not None:
+    _models, _load_lock = _twin._models, _twin._load_lock
+else:
+    _models = {}
+    _load_lock = threading.Lock()
+
+
+def get_embedder(model_name: str = EMBEDDING_MODEL):
+    """SentenceTransformer 모델 (첫 호출 시 로드, 이후 같은 객체 반환)"""
+    model = _models.get(model_name)
+    if model is None:
+        with _load_lock:
+            model = _models.get(model_name)
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+                model = _models[model_name] = SentenceTransformer(model_name)
+                logger.info(f"임베딩 모델 로드 완료 ({model_name})")
+    return model
+
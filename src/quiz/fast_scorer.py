@@ -0,0 +1,217 @@
+# === src/quiz/fast_scorer.py ===
+# LLM 채점 전 로컬 선별 단계: 빈 답안 / 의미 없는 입력 / 모범답안과 (거의) 같은 답안 / 무관한 답안은
+# 템플릿 피드백으로 바로 확정하고, 애매한 답안만 LLM 평가로 넘김
+import os, re, asyncio, logging, threading
+from typing import NamedTuple, Optional
+from src.quiz.embedding import EMBEDDING_MODEL, get_embedder
+
+logger = logging.getLogger(__name__)
+
+# 비교에서 제외할 형태소 품사 (문장부호·기호·외국어 기호 등)
+_SKIP_TAGS = ("SF", "SP", "SS", "SSO", "SSC", "SE", "SO", "SW", "SWK")
+# 실질 형태소 (체언·용언·수식언·어근·외국어·숫자)
+_CONTENT_TAG_PREFIXES = ("NN", "NP", "NR", "VV", "VA", "MA", "MM", "XR", "SL", "SN")
+# 부정 형태소 (보조용언 않/못, 부사 안/못, 부정 지정사 아니) - 임베딩 유사도는 부정을 잘 구분하지 못함
+_NEGATION_MORPHS = {("않", "VX"), ("못", "VX"), ("안", "MAG"), ("못", "MAG"), ("아니", "VCN")}
+
+_HANGUL_SYLLABLE_RE = re.compile(r"[가-힣]")
+_WORD_CHAR_RE = re.compile(r"[가-힣A-Za-z0-9]")
+
+# === 템플릿 피드백 (LLM 피드백과 같은 "의미/맥락/문법" 형식) ===
+FEEDBACK_TEMPLATES = {
+    "blank": (
+        "답안이 비어 있어 평가할 수 없습니다. 기사 핵심 내용을 한 문장으로 적어 보세요.",
+        "문장을 작성하면 기사 흐름과의 연결을 평가해 드릴게요.",
+        "문장을 작성하면 문법을 함께 확인해 드릴게요.",
+    ),
+    "gibberish": (
+        "의미를 파악할 수 있는 문장이 아니에요. 기사 핵심 내용을 담아 다시 작성해 보세요.",
+        "기사 흐름과 연결되는 내용을 찾기 어려워요. 앞뒤 문맥을 떠올리며 써 보세요.",
+        "완성된 문장 형태로 작성해 주시면 문법을 평가해 드릴게요.",
+    ),
+    "off_topic": (
+        "기사 핵심 내용과 관련이 적은 문장이에요. 모범답안의 주장과 방향을 다시 확인해 보세요.",
+        "기사 흐름과 이어지지 않아요. 앞 문장과의 인과나 설명 관계를 생각해 보세요.",
+        "문장 구성은 이해되지만 내용이 기사와 맞지 않아 문법 평가는 생략했어요.",
+    ),
+    "exact": (
+        "모범답안과 같은 의미를 정확하게 전달했어요. 핵심 주장을 잘 파악하셨습니다.",
+        "기사 흐름에 자연스럽게 이어지는 문장이에요.",
+        "조사와 어미가 자연스럽고 문법적으로 정확한 문장이에요.",
+    ),
+    "near_exact": (
+        "모범답안의 핵심 의미를 거의 그대로 잘 전달했어요. 세부 표현만 조금 다듬어 보세요.",
+        "기사 흐름과 잘 어울리는 문장이에요. 핵심 키워드도 잘 담았습니다.",
+        "전반적으로 자연스러운 문장이에요. 표현을 한 번 더 점검해 보세요.",
+    ),
+}
+
+# 판정별 (의미, 맥락, 문법) 점수 - 가중치 합산은 평가기의 weighted_total을 그대로 사용
+VERDICT_SCORES = {
+    "blank": (0, 0, 0),
+    "gibberish": (0, 0, 0),
+    "off_topic": (10, 10, 50),
+    "exact": (100, 100, 100),
+    "near_exact": (95, 90, 90),
+}
+
+
+class FastVerdict(NamedTuple):
+    verdict: str
+    scores: tuple        # (meaning, context, grammar)
+    feedbacks: tuple     # (meaning, context, grammar)
+    similarity: Optional[float] = None
+
+
+class FastScorer:
+    """kiwipiepy 형태소 정규화 + ko-sroberta 임베딩 유사도로 명백한 답안만 로컬에서 확정.
+    모델은 첫 사용 시 로드하며, 로드 실패 시 선별 없이 모두 LLM으로 넘김"""
+
+    def __init__(self, accept_threshold: float = 0.95, reject_threshold: float = 0.2,
+                 min_overlap: float = 0.8, model_name: str = EMBEDDING_MODEL):
+        self.accept_threshold = accept_threshold   # 이상이면 near_exact
+        self.reject_threshold = reject_threshold   # 미만이면 off_topic
+        self.min_overlap = min_overlap             # near_exact 판정에 필요한 실질 형태소 F1
+        self.model_name = model_name
+
+        self._kiwi = None
+        self._embedder = None
+        self._load_lock = threading.Lock()
+        self._disabled = False
+
+        self.stats = {"checked": 0, "passed": 0, **{verdict: 0 for verdict in VERDICT_SCORES}}
+
+    @classmethod
+    def from_env(cls) -> Optional["FastScorer"]:
+        """FEEDBACK_FAST_PATH_ENABLED=1 일 때만 사용 (기본: 모든 답안을 LLM으로 평가 - 실제 답안으로 검증 후 활성화)"""
+        if os.getenv("FEEDBACK_FAST_PATH_ENABLED", "0") != "1":
+            return None
+        return cls(
+            accept_threshold=float(os.getenv("FEEDBACK_FAST_ACCEPT_THRESHOLD", "0.95")),
+            reject_threshold=float(os.getenv("FEEDBACK_FAST_REJECT_THRESHOLD", "0.2")),
+            min_overlap=float(os.getenv("FEEDBACK_FAST_MIN_OVERLAP", "0.8")),
+        )
+
+    @property
+    def signature(self) -> str:
+        """캐시 네임스페이스용 - 임계값이 바뀌면 이전 판정을 재사용하지 않음"""
+        return f"fast:{self.accept_threshold}:{self.reject_threshold}:{self.min_overlap}:f1neg"
+
+    @property
+    def short_circuit_rate(self) -> float:
+        checked = self.stats["checked"]
+        return (checked - self.stats["passed"]) / checked if checked else 0.0
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "short_circuit_rate": round(self.short_circuit_rate, 4)}
+
+    # === 모델 로드 (lazy) ===
+    def _ensure_models(self) -> bool:
+        if self._disabled:
+            return False
+        if self._embedder is not None:
+            return True
+        with self._load_lock:
+            if self._embedder is None and not self._disabled:
+                try:
+                    from kiwipiepy import Kiwi
+                    self._kiwi = Kiwi()
+                    # 파이프라인 생성기와 같은 프로세스 공용 모델 사용 (워커당 ko-sroberta 1벌)
+                    self._embedder = get_embedder(self.model_name)
+                    logger.info("로컬 선별 채점 모델 로드 완료 (%s)", self.model_name)
+                except Exception:
+                    logger.exception("로컬 선별 채점 모델 로드 실패 → 모든 답안을 LLM으로 평가")
+                    self._disabled = True
+        return not self._disabled
+
+    def warmup(self):
+        """기동 시 모델을 미리 로드해 첫 요청 지연을 없앰"""
+        self._ensure_models()
+
+    # === 판정 ===
+    def _morphs(self, text: str) -> list:
+        return [
+            (token.form, token.tag)
+            for token in self._kiwi.tokenize(text)
+            if token.tag not in _SKIP_TAGS
+        ]
+
+    @staticmethod
+    def _is_gibberish(text: str, morphs: list) -> bool:
+        """한글 음절·영문·숫자가 거의 없거나(자모 나열, 기호) 실질 형태소가 없는 입력"""
+        compact = re.sub(r"\s+", "", text)
+        word_chars = len(_WORD_CHAR_RE.findall(compact))
+        if word_chars < 2 or word_chars / len(compact) < 0.5:
+            return True
+        if _HANGUL_SYLLABLE_RE.search(compact) and not any(
+            tag.startswith(_CONTENT_TAG_PREFIXES) for _, tag in morphs
+        ):
+            return True
+        return False
+
+    @staticmethod
+    def _overlap(ref_morphs: list, user_morphs: list) -> float:
+        """양쪽 실질 형태소 집합의 F1 - 학습자 답안에만 있는 형태소(덧붙인 내용)도 감점"""
+        ref = {m for m in ref_morphs if m[1].startswith(_CONTENT_TAG_PREFIXES)}
+        user = {m for m in user_morphs if m[1].startswith(_CONTENT_TAG_PREFIXES)}
+        common = len(ref & user)
+        if not common:
+            return 0.0
+        precision, recall = common / len(user), common / len(ref)
+        return 2 * precision * recall / (precision + recall)
+
+    @staticmethod
+    def _negation_mismatch(ref_morphs: list, user_morphs: list) -> bool:
+        """부정 표현 개수가 다르면 True ("증가했다" vs "증가하지 않았다") → 로컬 확정 금지"""
+        def count(morphs):
+            return sum(1 for m in morphs if m in _NEGATION_MORPHS)
+        return count(ref_morphs) != count(user_morphs)
+
+    def _classify(self, reference: str, user_answer: str) -> FastVerdict | None:
+        if not (user_answer or "").strip():
+            return self._verdict("blank")
+        if not self._ensure_models():
+            return None
+
+        user_morphs = self._morphs(user_answer)
+        if self._is_gibberish(user_answer, user_morphs):
+            return self._verdict("gibberish")
+
+        ref_morphs = self._morphs(reference)
+        # 띄어쓰기·문장부호만 다른 경우 (형태소 열이 동일)
+        if user_morphs == ref_morphs:
+            return self._verdict("exact", 1.0)
+
+        ref_vec, user_vec = self._embedder.encode(
+            [reference, user_answer], normalize_embeddings=True, convert_to_numpy=True
+        )
+        similarity = float(ref_vec @ user_vec)
+
+        if (similarity >= self.accept_threshold
+                and not self._negation_mismatch(ref_morphs, user_morphs)
+                and self._overlap(ref_morphs, user_morphs) >= self.min_overlap):
+            return self._verdict("near_exact", similarity)
+        if similarity < self.reject_threshold:
+            return self._verdict("off_topic", similarity)
+        return None
+
+    @staticmethod
+    def _verdict(verdict: str, similarity: float = None) -> FastVerdict:
+        return FastVerdict(verdict, VERDICT_SCORES[verdict], FEEDBACK_TEMPLATES[verdict], similarity)
+
+    async def score(self, reference: str, user_answer: str) -> FastVerdict | None:
+        """명백한 답안이면 FastVerdict, 애매하면 None (→ LLM 평가).
+        형태소 분석·임베딩은 CPU 작업이므로 스레드에서 실행해 이벤트 루프를 막지 않음"""
+        try:
+            result = await asyncio.to_thread(self._classify, reference, user_answer)
+        except Exception:
+            logger.exception("로컬 선별 채점 중 오류 → LLM 평가로 전환")
+            result = None
+
+        self.stats["checked"] += 1
+        if result is None:
+            self.stats["passed"] += 1
+        else:
+            self.stats[result.verdict] += 1
+            logger.info("로컬 선별 채점 확정: %s (similarity=%s)", result.verdict, result.similarity)
+        return result
@@ -0,0 +1,166 @@
+# === src/quiz/feedback_cache.py ===
+import os, re, time, sqlite3, hashlib, asyncio, logging, threading, unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_answer(text: str) -> str:
+    """캐시 키용 정규화 - 유니코드 정규화(NFKC) + 연속 공백 축약 (띄어쓰기 자체는 문법 평가 대상이므로 유지)"""
+    text = unicodedata.normalize("NFKC", text or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class FeedbackCache:
+    """(referenceAnswer, userAnswer) → (AIScore, AIFeedback) LRU+TTL 캐시.
+    동일 키 동시 요청은 진행 중인 평가 1건을 공유(single-flight)하고, db_path가 있으면 SQLite에 영속화"""
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 86400, db_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, int, str]]" = OrderedDict()
+        self._inflight: "dict[str, asyncio.Task]" = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+        self._db = None
+        self._db_lock = threading.Lock()   # SQLite 접근 전용 (메모리 캐시 잠금과 분리 → 디스크 대기가 L1 조회를 막지 않음)
+        self._writer = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS feedback_cache ("
+                "key TEXT PRIMARY KEY, score INTEGER NOT NULL, feedback TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM feedback_cache WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+            # 쓰기(commit = fsync)는 전용 스레드 1개가 순서대로 처리 → 이벤트 루프와 응답을 막지 않음
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="feedback-cache-writer")
+            logger.info("피드백 캐시 SQLite 사용 → %s", db_path)
+
+    @classmethod
+    def from_env(cls) -> Optional["FeedbackCache"]:
+        """FEEDBACK_CACHE_ENABLED=0 이면 None (캐시 비활성화)"""
+        if os.getenv("FEEDBACK_CACHE_ENABLED", "1") != "1":
+            return None
+        return cls(
+            max_entries=int(os.getenv("FEEDBACK_CACHE_MAX_ENTRIES", "4096")),
+            ttl=float(os.getenv("FEEDBACK_CACHE_TTL", "86400")),
+            db_path=os.getenv("FEEDBACK_CACHE_DB") or None,
+        )
+
+    @staticmethod
+    def make_key(namespace: str, reference: str, user_answer: str) -> str:
+        """namespace(모델·평가 방식)까지 포함해 설정이 바뀌면 캐시가 섞이지 않도록 함"""
+        raw = "\x1f".join([namespace, normalize_answer(reference), normalize_answer(user_answer)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    # === 조회 / 저장 ===
+    async def get(self, key: str) -> Optional[Tuple[int, str]]:
+        """메모리(L1) 조회 후 없으면 SQLite(L2) 조회 - 디스크 I/O는 스레드에서 실행"""
+        hit = self._get_memory(key)
+        if hit is not None or self._db is None:
+            return hit
+
+        row = await asyncio.to_thread(self._read_db, key)
+        if row is None or row[2] <= time.time():
+            return None
+        self._remember(key, row[2], row[0], row[1])
+        return row[0], row[1]
+
+    def _get_memory(self, key: str) -> Optional[Tuple[int, str]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1], entry[2]
+            del self._entries[key]
+        return None
+
+    def _read_db(self, key: str):
+        with self._db_lock:
+            if self._db is None:
+                return None
+            return self._db.execute(
+                "SELECT score, feedback, expires_at FROM feedback_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+    def set(self, key: str, score: int, feedback: str):
+        """메모리에는 즉시 반영, SQLite 쓰기는 쓰기 스레드에 넘기고 기다리지 않음"""
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, score, feedback)
+        if self._writer is not None:
+            self._writer.submit(self._write_db, key, score, feedback, expires_at)
+
+    def _write_db(self, key: str, score: int, feedback: str, expires_at: float):
+        try:
+            with self._db_lock:
+                if self._db is None:
+                    return
+                self._db.execute(
+                    "INSERT OR REPLACE INTO feedback_cache (key, score, feedback, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, score, feedback, expires_at),
+                )
+                self._db.commit()
+        except Exception:
+            logger.exception("피드백 캐시 SQLite 저장 실패")
+
+    def _remember(self, key: str, expires_at: float, score: int, feedback: str):
+        with self._lock:
+            self._entries[key] = (expires_at, score, feedback)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    # === single-flight ===
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Tuple[int, str, bool]]],
+    ) -> Tuple[int, str]:
+        """캐시 히트면 즉시 반환, 같은 키 평가가 진행 중이면 그 결과를 기다림.
+        compute는 (score, feedback, cacheable)을 반환 - 통신 오류가 섞인 결과는 저장하지 않음"""
+        hit = await self.get(key)
+        if hit is not None:
+            self.stats["hits"] += 1
+            return hit
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = asyncio.ensure_future(self._run(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        # 요청 하나가 취소되어도 공유 중인 평가는 계속 진행
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        # 기다리던 요청이 모두 취소된 경우에도 예외가 '미회수' 경고로 남지 않도록 확인
+        if not task.cancelled():
+            task.exception()
+
+    async def _run(self, key: str, compute) -> Tuple[int, str]:
+        score, feedback, cacheable = await compute()
+        if cacheable:
+            self.set(key, score, feedback)
+        return score, feedback
+
+    def close(self):
+        """남은 쓰기를 마친 뒤 DB 닫기"""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
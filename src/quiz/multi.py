@@ -4,12 +4,13 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 from datetime import datetime
 from dotenv import load_dotenv
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import util
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate 
 import yaml
 from langchain.schema.runnable import RunnableLambda
 from quiz.select_session import select_session
+from quiz.embedding import get_embedder
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +37,7 @@ def generate_multi_choice_quiz(selected_session=None):
     llm_n = ChatOpenAI(model="gpt-4o", temperature=0)
     llm_i = ChatOpenAI(model="gpt-4o", temperature=0.3)
     llm_harder = ChatOpenAI(model="gpt-5")
-    embedder = SentenceTransformer("jhgan/ko-sroberta-multitask")
+    embedder = get_embedder()  # 프로세스 공용 모델 (세션마다 새로 로드하지 않음)
 
     # === 4️. UTF-8 안전 YAML 로더 ===
     def load_utf8_prompt(path: str):
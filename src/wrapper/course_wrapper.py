@@ -1,8 +1,11 @@
 # === src/wrapper/course_wrapper.py ===
 import json, logging
+import sys
 from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parents[1]))
 from collections import defaultdict
 from datetime import datetime
+from wrapper.package_artifacts import publish_package, publish_day_bundle
 
 # === 로거 설정 ===
 logger = logging.getLogger(__name__)
@@ -186,8 +189,8 @@ def build_course_packages():
                         if isinstance(v, (dict, list)):
                             stack.append(v)
                             
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(final_package, f, ensure_ascii=False, indent=2)
+            # 원본(indent=2) + compact/gzip/br 배포 산출물 동시 저장
+            publish_package(output_path, final_package)
 
             logger.info(f"[{topic}] 통합 패키지 생성 완료 → {output_path.resolve()}")
 
@@ -196,6 +199,11 @@ def build_course_packages():
         except Exception as e:
             logger.error(f"[{topic}] 패키지 생성 중 오류 발생: {e}", exc_info=True)
 
+    # === /today 응답용 일별 번들 ===
+    try:
+        publish_day_bundle(QUIZ_PACKAGE_DIR, today)
+    except Exception as e:
+        logger.error(f"[{today}] 일별 번들 생성 중 오류 발생: {e}", exc_info=True)
 
 
 if __name__ == "__main__":
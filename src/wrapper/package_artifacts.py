@@ -0,0 +1,226 @@
+# === src/wrapper/package_artifacts.py ===
+import os, gzip, json, hashlib, logging
+from pathlib import Path
+
+try:
+    import brotli  # 선택 의존성: 없으면 gzip만 생성
+except ImportError:
+    brotli = None
+
+from .package_projection import all_projections, project_package, projection_name
+
+logger = logging.getLogger(__name__)
+
+# === 패키지 배포용 산출물 위치: data/quiz/package/artifacts ===
+ARTIFACT_DIR_NAME = "artifacts"
+
+# === 인코딩별 파일 확장자 (identity = 압축 없는 compact JSON) ===
+ENCODING_SUFFIXES = {
+    "identity": ".min.json",
+    "gzip": ".min.json.gz",
+    "br": ".min.json.br",
+}
+
+
+def artifact_dir(package_dir: Path) -> Path:
+    return package_dir / ARTIFACT_DIR_NAME
+
+
+def compact_bytes(data) -> bytes:
+    """API 응답과 동일한 compact 직렬화"""
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Content-Encoding 값 기준 압축 (mtime=0 으로 결정적 출력)"""
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    if encoding == "br":
+        if brotli is None:
+            raise RuntimeError("brotli 모듈이 설치되어 있지 않습니다.")
+        return brotli.compress(body, quality=11)
+    raise ValueError(f"지원하지 않는 인코딩: {encoding}")
+
+
+def available_encodings() -> list:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def write_atomic(path: Path, data: bytes):
+    """임시 파일에 쓴 뒤 교체 → 읽는 쪽이 절반만 쓰인 파일을 보지 않도록 함"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def source_signature(path: Path) -> dict:
+    st = path.stat()
+    return {"name": path.name, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def _fragment_info(body: bytes, start: int, end: int) -> dict:
+    return {
+        "offset": start,
+        "length": end - start,
+        "sha256": hashlib.sha256(body[start:end]).hexdigest(),
+    }
+
+
+def index_fragments(package) -> tuple:
+    """compact 직렬화 + 코스/세션 단위 바이트 오프셋 인덱스 생성.
+    결과 바이트는 compact_bytes(package)와 동일하므로 compact 산출물에서 바로 잘라 쓸 수 있음"""
+    buf = bytearray()
+    spans = {}
+
+    def write_session_list(course_key: str, sessions: list):
+        buf.extend(b"[")
+        for i, session in enumerate(sessions):
+            if i:
+                buf.extend(b",")
+            start = len(buf)
+            buf.extend(compact_bytes(session))
+            if isinstance(session, dict):
+                spans[course_key]["sessions"][str(session.get("sessionId"))] = (start, len(buf))
+        buf.extend(b"]")
+
+    def write_course(course):
+        if not isinstance(course, dict):
+            buf.extend(compact_bytes(course))
+            return
+        course_key = str(course.get("courseId"))
+        spans[course_key] = {"sessions": {}}
+        start = len(buf)
+        buf.extend(b"{")
+        for i, (k, v) in enumerate(course.items()):
+            if i:
+                buf.extend(b",")
+            buf.extend(compact_bytes(k) + b":")
+            if k == "sessions" and isinstance(v, list):
+                write_session_list(course_key, v)
+            else:
+                buf.extend(compact_bytes(v))
+        buf.extend(b"}")
+        spans[course_key]["span"] = (start, len(buf))
+
+    def write_course_list(courses: list):
+        buf.extend(b"[")
+        for i, course in enumerate(courses):
+            if i:
+                buf.extend(b",")
+            write_course(course)
+        buf.extend(b"]")
+
+    if isinstance(package, dict):
+        buf.extend(b"{")
+        for i, (k, v) in enumerate(package.items()):
+            if i:
+                buf.extend(b",")
+            buf.extend(compact_bytes(k) + b":")
+            if k == "courses" and isinstance(v, list):
+                write_course_list(v)
+            else:
+                buf.extend(compact_bytes(v))
+        buf.extend(b"}")
+    elif isinstance(package, list):
+        write_course_list(package)
+    else:
+        buf.extend(compact_bytes(package))
+
+    body = bytes(buf)
+    index = {}
+    for course_key, course_spans in spans.items():
+        index[course_key] = {
+            **_fragment_info(body, *course_spans["span"]),
+            "sessions": {
+                sid: _fragment_info(body, *span)
+                for sid, span in course_spans["sessions"].items()
+            },
+        }
+    return body, index
+
+
+def write_artifact(package_dir: Path, stem: str, data, sources: list,
+                   body: bytes = None, extra: dict = None) -> dict:
+    """compact + 압축본 + manifest 저장. manifest에는 원본 파일 시그니처(신선도 판단)와
+    본문 sha256(ETag)을 기록해 API가 요청마다 해시를 계산하지 않도록 함"""
+    out_dir = artifact_dir(package_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    if body is None:
+        body = compact_bytes(data)
+    files = {}
+    for encoding in ["identity"] + available_encodings():
+        payload = body if encoding == "identity" else compress(body, encoding)
+        file_name = f"{stem}{ENCODING_SUFFIXES[encoding]}"
+        write_atomic(out_dir / file_name, payload)
+        files[encoding] = {"name": file_name, "size": len(payload)}
+
+    manifest = {
+        "stem": stem,
+        "sources": [source_signature(p) for p in sources],
+        "sha256": hashlib.sha256(body).hexdigest(),
+        "files": files,
+        **(extra or {}),
+    }
+    write_atomic(out_dir / f"{stem}.manifest.json", compact_bytes(manifest))
+
+    logger.info(
+        f"[{stem}] 배포 산출물 저장 완료 → "
+        + ", ".join(f"{enc}={info['size']}B" for enc, info in files.items())
+    )
+    return manifest
+
+
+def artifact_stem(stem: str, projection: str = None) -> str:
+    """프로젝션 산출물 이름: {stem}.{projection} (예: economy_2026-01-11_package.N-full)"""
+    return f"{stem}.{projection}" if projection else stem
+
+
+def publish_package(output_path: Path, package: dict) -> dict:
+    """패키지 원본(indent=2) 저장 + 배포용 산출물(코스/세션 오프셋 인덱스 포함) 생성.
+    level/fields 프로젝션도 함께 만들어 API가 요청 시 가공하지 않도록 함"""
+    write_atomic(
+        output_path,
+        json.dumps(package, ensure_ascii=False, indent=2).encode("utf-8"),
+    )
+
+    manifest = None
+    for level, fields in [(None, "full")] + all_projections():
+        projected = project_package(package, level, fields)
+        body, fragments = index_fragments(projected)
+        result = write_artifact(
+            output_path.parent,
+            artifact_stem(output_path.stem, projection_name(level, fields)),
+            projected, [output_path],
+            body=body, extra={"fragments": fragments},
+        )
+        if manifest is None:
+            manifest = result
+    return manifest
+
+
+def publish_day_bundle(package_dir: Path, date: str) -> dict:
+    """/api/course/today 응답 본문({"courses": [패키지, ...]})을 프로젝션별로 미리 만들어 압축 저장"""
+    package_paths = sorted(package_dir.glob(f"*_{date}_package.json"))
+    if not package_paths:
+        logger.warning(f"[{date}] 일별 번들 대상 패키지가 없습니다.")
+        return {}
+
+    packages = []
+    for p in package_paths:
+        with open(p, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        packages.extend(data if isinstance(data, list) else [data])
+
+    manifest = None
+    for level, fields in [(None, "full")] + all_projections():
+        bundle = {"courses": [project_package(p, level, fields) for p in packages]}
+        result = write_artifact(
+            package_dir,
+            artifact_stem(f"{date}_today", projection_name(level, fields)),
+            bundle, package_paths,
+        )
+        if manifest is None:
+            manifest = result
+    return manifest
@@ -0,0 +1,87 @@
+# === src/wrapper/package_projection.py ===
+# 패키지 응답 프로젝션 (level / fields) 정의 - wrapper 배포 시 미리 생성, API는 같은 규칙으로 폴백
+
+LEVELS = ("N", "I", "E")
+
+# === fields 종류 ===
+# full     : 전체 (기본값)
+# steps    : 요약문(summary)과 퀴즈 contents 제외 - 단계 구성(stepOrder, contentType)만 유지
+# skeleton : 요약문과 퀴즈 전체 제외 - 코스/세션 목록 화면용
+FIELD_SETS = ("full", "steps", "skeleton")
+
+
+def projection_name(level: str = None, fields: str = "full") -> "str | None":
+    """(level, fields) → 산출물 이름 접미사. 전체 패키지면 None"""
+    if fields not in FIELD_SETS:
+        raise ValueError(f"지원하지 않는 fields: {fields}")
+    if level is not None and level not in LEVELS:
+        raise ValueError(f"지원하지 않는 level: {level}")
+
+    # skeleton은 퀴즈가 없으므로 level 구분이 의미 없음
+    if fields == "skeleton":
+        level = None
+    if level is None and fields == "full":
+        return None
+    return f"{level or 'all'}-{fields}"
+
+
+def parse_projection(name: str = None) -> tuple:
+    """projection_name의 역변환 → (level, fields)"""
+    if name is None:
+        return None, "full"
+    level, _, fields = name.partition("-")
+    return (None if level == "all" else level), fields
+
+
+def all_projections() -> list:
+    """배포 시 미리 만들어 둘 (level, fields) 조합"""
+    combos = [(None, "steps"), (None, "skeleton")]
+    for level in LEVELS:
+        combos.append((level, "full"))
+        combos.append((level, "steps"))
+    return combos
+
+
+def _project_session(session: dict, level: str, fields: str) -> dict:
+    projected = {k: v for k, v in session.items() if k not in ("summary", "quizzes") or fields == "full"}
+    if fields == "skeleton" or "quizzes" not in session:
+        return projected
+
+    quizzes = []
+    for quiz in session.get("quizzes", []):
+        if level is not None and quiz.get("level") != level:
+            continue
+        if fields == "steps":
+            quiz = {
+                **{k: v for k, v in quiz.items() if k != "steps"},
+                "steps": [
+                    {k: v for k, v in step.items() if k != "contents"}
+                    for step in quiz.get("steps", [])
+                ],
+            }
+        quizzes.append(quiz)
+    projected["quizzes"] = quizzes
+    return projected
+
+
+def project_package(package, level: str = None, fields: str = "full"):
+    """{"courses": [...]} 패키지(또는 코스 리스트)에 프로젝션 적용. 원본은 변경하지 않음"""
+    if projection_name(level, fields) is None:
+        return package
+
+    def project_course(course):
+        if not isinstance(course, dict):
+            return course
+        return {
+            **course,
+            "sessions": [
+                _project_session(s, level, fields) if isinstance(s, dict) else s
+                for s in course.get("sessions", [])
+            ],
+        }
+
+    if isinstance(package, list):
+        return [project_course(c) for c in package]
+    if isinstance(package, dict) and isinstance(package.get("courses"), list):
+        return {**package, "courses": [project_course(c) for c in package["courses"]]}
+    return package